@@ -1,17 +1,117 @@
+import time
+START_TIME = time.perf_counter()
+
 import os
+import socket
+import argparse
 import pygame
 from src.core.game import Game
-from src.utils.debug import debug_print
+from src.core.input import LiveInput, QueuedInput
+from src.core.pipeline import run_pipelined
+from src.core.async_loop import run_async
+from src.core.pacing import FramePacer
+from src.core.capture import RAW_EXTENSION
+from src.core.replay import InputRecorder, ReplayInput, new_seed, replay_session
+from src.net import UdpTransport, GameServer, ClientGame, connect
+from src.utils.constants import SAVE_FILE, TELEMETRY_FILE, NET_PORT, CAPTURE_FPS
+from src.utils.debug import debug_print, StartupTimer
+
+def seed_type(text):
+    """A seed that fits the 32 bits recordings store it in"""
+    seed = int(text)
+    if not 0 <= seed < 2 ** 32:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {2 ** 32 - 1}")
+    return seed
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ocean Explorer")
+    parser.add_argument('--record', metavar='FILE', help="record this session's input to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="replay a recorded session from FILE")
+    parser.add_argument('--headless', action='store_true',
+                        help="with --replay, run without a window as fast as possible")
+    parser.add_argument('--seed', type=seed_type, help="random seed for the ocean layout")
+    parser.add_argument('--autosave', nargs='?', const=SAVE_FILE, metavar='FILE',
+                        help=f"periodically save progress to FILE (default {SAVE_FILE})")
+    parser.add_argument('--resume', action='store_true', help="continue from the autosave file if there is one")
+    parser.add_argument('--telemetry', nargs='?', const=TELEMETRY_FILE, metavar='FILE',
+                        help=f"record learning analytics to the SQLite database FILE (default {TELEMETRY_FILE})")
+    parser.add_argument('--full-rate', action='store_true',
+                        help="always run at full frame rate instead of slowing down while idle")
+    parser.add_argument('--hot-reload', action='store_true',
+                        help="pick up edits to files in assets/ while the game is running")
+    parser.add_argument('--memory-profile', action='store_true',
+                        help="report allocations per frame phase and garbage collector pauses on exit")
+    parser.add_argument('--defer-gc', action='store_true',
+                        help="freeze loaded assets and only collect garbage on quiet frames")
+    parser.add_argument('--capture', metavar='PATH',
+                        help=f"record gameplay video as PNGs in the directory PATH, or into PATH if it ends in {RAW_EXTENSION}")
+    parser.add_argument('--capture-fps', type=int, default=CAPTURE_FPS, metavar='FPS',
+                        help=f"frames per second to capture (default {CAPTURE_FPS})")
+    net_mode = parser.add_mutually_exclusive_group()
+    net_mode.add_argument('--server', nargs='?', const=NET_PORT, type=int, metavar='PORT',
+                          help=f"host a co-op ocean for other players on PORT (default {NET_PORT})")
+    net_mode.add_argument('--connect', metavar='HOST[:PORT]', help="join the co-op ocean hosted at HOST")
+    loop_mode = parser.add_mutually_exclusive_group()
+    loop_mode.add_argument('--pipelined', action='store_true',
+                           help="simulate on a background thread and render on the main thread")
+    loop_mode.add_argument('--async', dest='use_async', action='store_true',
+                           help="run the game loop on asyncio so background coroutines can run between frames")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     # Create asset directories if they don't exist
     os.makedirs(os.path.join('assets', 'images'), exist_ok=True)
     os.makedirs(os.path.join('assets', 'sounds'), exist_ok=True)
-    
+
+    if args.replay and args.headless:
+        summary = replay_session(args.replay)
+        for key, value in summary.items():
+            print(f"{key}: {value}")
+        return
+
+    if args.server is not None:
+        GameServer(UdpTransport(('0.0.0.0', args.server)), seed=args.seed).run()
+        return
+
     debug_print("Ocean Explorer starting...", True)
-    game = Game()
-    game.run()
+    startup_timer = StartupTimer(START_TIME)
+    startup_timer.mark('imports')
+    # In pipelined mode the main thread feeds window input to the simulation
+    feed = QueuedInput() if args.pipelined else None
+    live = feed or LiveInput()
+    options = dict(memory_profile=args.memory_profile, defer_gc=args.defer_gc,
+                   capture_path=args.capture, capture_fps=args.capture_fps)
+    if args.connect:
+        host, _, port = args.connect.partition(':')
+        client = connect(UdpTransport(), (socket.gethostbyname(host), int(port or NET_PORT)))
+        if client is None:
+            return
+        game = ClientGame(client, input_source=live, startup_timer=startup_timer,
+                          telemetry_path=args.telemetry, hot_reload=args.hot_reload, **options)
+    elif args.replay:
+        feed = None
+        # The pipelined runner pumps the window on the main thread itself
+        source = ReplayInput(args.replay, pump_window=not args.pipelined)
+        game = Game(input_source=source, seed=source.seed, startup_timer=startup_timer, **options)
+    elif args.record:
+        seed = args.seed if args.seed is not None else new_seed()
+        game = Game(input_source=InputRecorder(live, args.record, seed), seed=seed,
+                    startup_timer=startup_timer, **options)
+    else:
+        game = Game(input_source=live, seed=args.seed, autosave_path=args.autosave,
+                    startup_timer=startup_timer, telemetry_path=args.telemetry,
+                    hot_reload=args.hot_reload, **options)
+        if args.resume:
+            game.load_save(args.autosave or SAVE_FILE)
+
+    if args.pipelined:
+        run_pipelined(game, feed)
+    elif args.use_async:
+        run_async(game)
+    else:
+        game.run(None if args.full_rate or args.replay else FramePacer())
 
 if __name__ == "__main__":
     main()
-
@@ -10,5 +10,5 @@ setup(
     author="South Hampshire College Group",
     description="An interactive educational game for children to learn about sea creatures",
     keywords="education, children, ocean, game",
-    python_requires=">=3.6",
+    python_requires=">=3.9",
 )
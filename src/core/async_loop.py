@@ -0,0 +1,126 @@
+"""
+asyncio variant of Game.run.
+
+The loop simulates and draws a frame, then sleeps on the event loop until the
+next frame is due, so coroutines scheduled with AsyncGameLoop.schedule() (I/O,
+autosaves, talking to a classroom server) run in the gaps between frames.
+"""
+import time
+import asyncio
+
+from ..utils.constants import FPS
+from ..utils.debug import debug_print
+
+class FrameBudget:
+    """Time a background task may spend per frame before it should yield.
+
+    Long-running coroutines call `await budget.checkpoint()` between chunks of
+    work; it only yields to the event loop once the task has used up its slice
+    for the current frame, and pushes the rest of its work to the next frame.
+    """
+    def __init__(self, loop, budget_ms):
+        self.loop = loop
+        self.budget = budget_ms / 1000
+        self.frame = -1
+        self.slice_start = 0.0
+        self.yields = 0
+
+    def exhausted(self):
+        if self.frame != self.loop.frame:
+            self.frame = self.loop.frame
+            self.slice_start = time.perf_counter()
+            return False
+        return time.perf_counter() - self.slice_start >= self.budget
+
+    async def checkpoint(self):
+        if self.exhausted():
+            self.yields += 1
+            await self.loop.next_frame()
+            self.frame = self.loop.frame
+            self.slice_start = time.perf_counter()
+
+class AsyncGameLoop:
+    def __init__(self, game, fps=FPS):
+        self.game = game
+        self.frame_time = 1 / fps
+        self.frame = 0
+        self.tasks = set()
+        self.frame_started = None
+        self.late_frames = 0
+
+    def schedule(self, coroutine_function, budget_ms=2.0, name=None):
+        """Run `coroutine_function(budget)` alongside the game loop.
+
+        The coroutine receives a FrameBudget and should await its checkpoint()
+        regularly. Returns the asyncio task.
+        """
+        budget = FrameBudget(self, budget_ms)
+        task = asyncio.ensure_future(coroutine_function(budget))
+        if name:
+            task.set_name(name)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            debug_print(f"Error in background task {task.get_name()}: {task.exception()!r}", True)
+
+    async def next_frame(self):
+        """Wait until the next frame has started"""
+        frame = self.frame
+        while self.frame == frame:
+            await self.frame_started.wait()
+
+    async def run(self):
+        game = self.game
+        self.frame_started = asyncio.Event()
+        next_deadline = time.perf_counter()
+        running = True
+        first_frame = True
+        while running:
+            self.frame += 1
+            # Wake tasks waiting for a new frame and immediately re-arm
+            self.frame_started.set()
+            self.frame_started.clear()
+
+            running = game.step()
+            with game.phase('autosave'):
+                game.autosave()
+            with game.phase('draw'):
+                game.draw()
+            if first_frame:
+                first_frame = False
+                game.first_frame_done()
+
+            # Pace against absolute deadlines so background work that overruns
+            # one frame does not push every later frame back
+            next_deadline += self.frame_time
+            delay = next_deadline - time.perf_counter()
+            if delay < 0:
+                self.late_frames += 1
+                next_deadline = time.perf_counter()
+                delay = 0
+            await asyncio.sleep(delay)
+
+        for task in list(self.tasks):
+            task.cancel()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+def run_async(game, setup=None):
+    """Run `game` on a fresh asyncio event loop.
+
+    `setup`, if given, is called with the AsyncGameLoop before the first frame
+    so it can schedule background coroutines.
+    """
+    loop = AsyncGameLoop(game)
+
+    async def main():
+        if setup is not None:
+            setup(loop)
+        await loop.run()
+
+    asyncio.run(main())
+    game.shutdown()
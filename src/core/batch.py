@@ -0,0 +1,188 @@
+"""
+Batch playtesting: runs many headless bot sessions across a process pool and
+aggregates their stats into one report.
+
+Usage:
+    python -m src.core.batch --sessions 1000 --processes 8 --accuracy 0.7
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+
+from .bot import BotInput
+from ..utils.constants import FPS
+from ..utils.pool import gc_collections
+
+# Frame times are collected into fixed-width buckets so workers ship a small
+# histogram back to the parent instead of every sample
+BUCKET_MS = 0.1
+BUCKETS = 1000
+
+# One Game per worker process, reset between sessions so assets load only once
+_game = None
+
+def _init_worker():
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    # SDL turns SIGTERM into a QUIT event by default, which would stop
+    # Pool.terminate() from ever reaping the workers
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+def histogram_percentile(histogram, q):
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+    threshold = total * q / 100
+    running = 0
+    for i, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            return round((i + 1) * BUCKET_MS, 1)
+    return round(len(histogram) * BUCKET_MS, 1)
+
+def run_session(job):
+    """Play one bot session in this process and return its stats"""
+    global _game
+    seed, accuracy, max_ticks, render = job
+    from .game import Game
+
+    bot = BotInput(seed=seed, accuracy=accuracy, max_ticks=max_ticks)
+    if _game is None:
+        _game = Game(input_source=bot, seed=seed, headless=True)
+    else:
+        _game.input = bot
+        _game.reset(seed)
+    game = _game
+    bot.attach(game)
+
+    histogram = [0] * BUCKETS
+    perf_counter = time.perf_counter
+    collections_before = gc_collections()
+    running = True
+    while running:
+        frame_start = perf_counter()
+        running = game.step()
+        if render:
+            game.draw()
+        bucket = int((perf_counter() - frame_start) * 1000 / BUCKET_MS)
+        histogram[min(bucket, BUCKETS - 1)] += 1
+    bot.close()
+    memory = game.memory_stats()
+
+    return {
+        'seed': seed,
+        'completed': bot.completed,
+        'ticks': bot.ticks,
+        'scene_ticks': bot.scene_ticks,
+        'minigame_scores': dict(game.minigame_scores),
+        'stars': game.player.stars,
+        'bubbles_popped': game.bubble_count,
+        'frame_ms_p50': histogram_percentile(histogram, 50),
+        'frame_ms_p99': histogram_percentile(histogram, 99),
+        'histogram': histogram,
+        'gc_collections': [after - before for after, before
+                           in zip(memory['gc_collections'], collections_before)],
+        'entity_bytes': memory['entity_bytes'],
+    }
+
+def tick_stats(ticks):
+    """Mean, percentiles and max of a sorted list of tick counts"""
+    if not ticks:
+        return {'mean': None, 'p50': None, 'p90': None, 'max': None, 'mean_seconds': None}
+    mean = sum(ticks) / len(ticks)
+    return {
+        'mean': round(mean, 1),
+        'p50': ticks[len(ticks) // 2],
+        'p90': ticks[int(len(ticks) * 0.9)],
+        'max': ticks[-1],
+        'mean_seconds': round(mean / FPS, 1),
+    }
+
+def run_batch(sessions, processes=None, accuracy=0.8, max_ticks=36000, render=True, base_seed=0):
+    """Run `sessions` bot sessions over a process pool and return an aggregated report"""
+    processes = processes or os.cpu_count() or 1
+    jobs = [(base_seed + i, accuracy, max_ticks, render) for i in range(sessions)]
+    # Several chunks per worker keeps the cores evenly loaded without paying
+    # a round trip per session
+    chunksize = max(1, sessions // (processes * 4))
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        results = list(pool.imap_unordered(run_session, jobs, chunksize))
+        pool.close()
+        pool.join()
+    elapsed = time.perf_counter() - start
+
+    histogram = [0] * BUCKETS
+    for result in results:
+        for i, count in enumerate(result.pop('histogram')):
+            histogram[i] += count
+
+    gc_totals = [0, 0, 0]
+    entity_bytes = {}
+    for result in results:
+        for generation, count in enumerate(result.pop('gc_collections')):
+            gc_totals[generation] += count
+        entity_bytes.update(result.pop('entity_bytes'))
+
+    finished = [r for r in results if r['completed']]
+    completed = sorted(r['ticks'] for r in finished)
+    # Mini-game rounds run on timers, so exploring and quizzing is reported on its own
+    exploring = sorted(r['ticks'] - r['scene_ticks'] for r in finished)
+    scores = {}
+    for result in results:
+        for title, score in result.pop('minigame_scores').items():
+            scores.setdefault(title, []).append(score)
+    slowest = sorted(results, key=lambda r: r['frame_ms_p99'], reverse=True)[:5]
+
+    return {
+        'sessions': sessions,
+        'processes': processes,
+        'accuracy': accuracy,
+        'wall_seconds': round(elapsed, 2),
+        'sessions_per_second': round(sessions / elapsed, 2) if elapsed else 0.0,
+        'completed': len(completed),
+        'ticks_to_completion': tick_stats(completed),
+        'explore_ticks_to_completion': tick_stats(exploring),
+        'minigame_score_mean': {
+            title: round(sum(values) / len(values), 2) for title, values in sorted(scores.items())
+        },
+        'stars_mean': round(sum(r['stars'] for r in results) / sessions, 2) if sessions else 0.0,
+        'bubbles_popped_mean': round(sum(r['bubbles_popped'] for r in results) / sessions, 2) if sessions else 0.0,
+        'frame_ms': {
+            'p50': histogram_percentile(histogram, 50),
+            'p90': histogram_percentile(histogram, 90),
+            'p99': histogram_percentile(histogram, 99),
+            'p999': histogram_percentile(histogram, 99.9),
+        },
+        'gc_collections': gc_totals,
+        'entity_bytes': entity_bytes,
+        'slowest_sessions': [
+            {'seed': r['seed'], 'frame_ms_p99': r['frame_ms_p99']} for r in slowest
+        ],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless Ocean Explorer bot sessions in parallel")
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--processes', type=int, default=None, help="defaults to the number of cores")
+    parser.add_argument('--accuracy', type=float, default=0.8, help="chance the bot answers correctly")
+    parser.add_argument('--max-ticks', type=int, default=36000, help="give up on a session after this many ticks")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first session")
+    parser.add_argument('--no-render', action='store_true', help="skip drawing to measure simulation only")
+    parser.add_argument('--json', metavar='FILE', help="also write the report to FILE")
+    args = parser.parse_args(argv)
+
+    report = run_batch(args.sessions, args.processes, args.accuracy,
+                       args.max_ticks, not args.no_render, args.seed)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(text)
+
+if __name__ == "__main__":
+    sys.exit(main())
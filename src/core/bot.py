@@ -0,0 +1,178 @@
+import math
+import random
+import pygame
+
+from .input import KeyState
+from ..utils.constants import EXPLORE, QUIZ, REWARD, SCREEN_HEIGHT
+from ..utils.timing import FrameClock, set_time_source
+
+class BotInput:
+    """Scripted player used as an input source for automated playtests.
+
+    Swims to the nearest unvisited creature, answers its quiz correctly with
+    probability `accuracy`, and pops nearby bubbles along the way. Mini-games
+    are played too, clicking at most once every `click_ticks`, and their
+    results are dismissed once read. Emits QUIT once every creature is
+    visited or `max_ticks` have passed.
+    """
+    def __init__(self, seed=None, accuracy=0.8, max_ticks=36000, pop_chance=0.05, read_ticks=30,
+                 click_ticks=10):
+        # The bot keeps its own random stream so it never perturbs the game's
+        self.rng = random.Random(seed)
+        self.accuracy = accuracy
+        self.max_ticks = max_ticks
+        self.pop_chance = pop_chance
+        self.read_ticks = read_ticks
+        self.click_ticks = click_ticks
+        self.clock = FrameClock()
+        set_time_source(self.clock)
+        self.game = None
+        self.events = []
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+        self.ticks = 0
+        self.scene_ticks = 0  # ticks spent in mini-games and other scenes
+        self.wait = 0
+        self.reading = False
+        self.completed = False
+
+    def attach(self, game):
+        self.game = game
+
+    def click(self, pos):
+        self.mouse_pos = (int(pos[0]), int(pos[1]))
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=self.mouse_pos, button=1)]
+
+    def poll(self):
+        if self.ticks:
+            self.clock.advance()
+        self.ticks += 1
+        self.keys = KeyState()
+        self.events = []
+
+        game = self.game
+        if game.scenes.handles(game.state):
+            self.scene_ticks += 1
+        if all(c.visited for c in game.creatures):
+            self.completed = True
+            self.events = [pygame.event.Event(pygame.QUIT)]
+        elif self.ticks >= self.max_ticks:
+            self.events = [pygame.event.Event(pygame.QUIT)]
+        elif game.scenes.handles(game.state):
+            self.events = self.play_scene()
+        elif self.wait > 0:
+            self.wait -= 1
+        elif game.state == EXPLORE:
+            self.events = self.explore()
+        elif game.state == QUIZ:
+            self.events = self.answer()
+        elif game.state == REWARD:
+            self.events = self.click(self.mouse_pos)
+            self.wait = self.read_ticks
+        return self.events
+
+    def explore(self):
+        player = self.game.player
+        target = min(
+            (c for c in self.game.creatures if not c.visited),
+            key=lambda c: (c.x - player.x) ** 2 + (c.y - player.y) ** 2
+        )
+
+        if target.can_interact and target.is_hovered:
+            return self.click((target.x, target.y))
+
+        self.keys = self.steer(player, target)
+
+        if self.rng.random() < self.pop_chance:
+            bubble = self.nearest_bubble(player.x, player.y, self.game.bubbles)
+            if bubble is not None:
+                return self.click((bubble.x, bubble.y))
+
+        # Keep the cursor on the target so it reads as hovered once in range
+        self.mouse_pos = (int(target.x), int(target.y))
+        return []
+
+    def steer(self, player, target):
+        """Arrow keys that take `player` towards `target`"""
+        held = []
+        if target is None:
+            return KeyState(held)
+        if target.x < player.x - player.speed:
+            held.append(pygame.K_LEFT)
+        elif target.x > player.x + player.speed:
+            held.append(pygame.K_RIGHT)
+        if target.y < player.y - player.speed:
+            held.append(pygame.K_UP)
+        elif target.y > player.y + player.speed:
+            held.append(pygame.K_DOWN)
+        return KeyState(held)
+
+    def play_scene(self):
+        """Play a mini-game round, then read and dismiss its results"""
+        scene = self.game.scene
+        ended = getattr(scene, 'ended', True)
+        if ended is None and scene.name == 'treasure_game':
+            # Swimming is held keys, so only clicks wait
+            self.keys = self.steer(scene.diver, self.nearest(scene.diver.x, scene.diver.y, scene.treasures))
+        if self.wait > 0:
+            self.wait -= 1
+            return []
+        if ended is not None:
+            if not self.reading:
+                self.reading = True
+                self.wait = self.read_ticks
+                return []
+            self.reading = False
+            return self.click(self.mouse_pos)
+
+        x, y = self.mouse_pos
+        if scene.name == 'bubble_game':
+            target = self.nearest_bubble(x, y, scene.bubbles, reach=None)
+        elif scene.name == 'seashell_game':
+            target = self.nearest(x, y, scene.shells)
+        else:
+            return []
+        if target is None:
+            return []
+        self.wait = self.click_ticks
+        return self.click((target.x, target.y))
+
+    def nearest(self, x, y, items):
+        """Closest item not yet collected, or None"""
+        best = None
+        best_distance = None
+        for item in items:
+            if item.collected:
+                continue
+            distance = (item.x - x) ** 2 + (item.y - y) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = item, distance
+        return best
+
+    def nearest_bubble(self, x, y, bubbles, reach=300):
+        best = None
+        best_distance = reach
+        for bubble in bubbles:
+            if bubble.popped or not 0 <= bubble.y <= SCREEN_HEIGHT:
+                continue
+            distance = math.hypot(bubble.x - x, bubble.y - y)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = bubble, distance
+        return best
+
+    def answer(self):
+        creature = self.game.current_creature
+        buttons = self.game.answer_buttons
+        if not buttons:
+            return []
+        question = creature.questions[creature.current_question_index - 1]
+        correct = question["correct"]
+        if self.rng.random() < self.accuracy or len(buttons) == 1:
+            choice = correct
+        else:
+            choice = self.rng.choice([i for i in range(len(buttons)) if i != correct])
+        self.wait = self.read_ticks
+        return self.click(buttons[choice].rect.center)
+
+    def close(self):
+        set_time_source(None)
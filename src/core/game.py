@@ -1,12 +1,25 @@
+import os
 import pygame
 import sys
 import random
 import math
-from pygame.locals import *
+from contextlib import nullcontext
+from pygame.locals import (
+    QUIT, MOUSEBUTTONDOWN, K_LEFT, K_RIGHT, K_UP, K_DOWN, K_a, K_d, K_w, K_s
+)
 
-from ..utils.constants import *
-from ..utils.debug import debug_print
-from ..utils.loader import load_image, load_sound, create_default_background
+from ..utils.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, AUTOSAVE_INTERVAL, FONT_NAME, PLAYER_IMAGE_SCALE, CAPTURE_FPS,
+    WHITE, BLACK, EXPLORE, QUIZ, REWARD, GAME_OVER, BUBBLE_GAME, TREASURE_GAME, SEASHELL_GAME
+)
+from ..utils.debug import debug_print, StartupTimer
+from ..utils.fonts import load_font
+from ..utils.timing import get_ticks
+from ..utils.pool import ObjectPool, instance_size, gc_collections
+from ..utils.telemetry import Telemetry
+from ..utils.memory import AllocationTracker, GcMonitor, DeferredGc, print_report
+from ..utils.loader import load_image, load_sound, load_creature_content, create_default_background
+from ..utils.sprites import primitives
 from ..entities.player import Player
 from ..entities.creature import Creature
 from ..entities.bubble import Bubble
@@ -16,54 +29,128 @@ from ..entities.clue import Clue  # Add this import
 from ..ui.button import Button
 from ..ui.animated_button import AnimatedButton
 from ..ui.effects import CelebrationEffect
+from ..ui.caustics import CausticsLayer
+from ..scenes import SceneManager, BubbleGame, TreasureGame, SeashellGame, GameOver
+from .input import LiveInput
+from .hot_reload import HotReloader
+from .capture import FrameCapture, CaptureError
+from .savestate import Autosaver, SaveStateError, load as load_save_state
+
+# Each discovery is followed by the next of these, in turn
+MINI_GAMES = (BUBBLE_GAME, TREASURE_GAME, SEASHELL_GAME)
+
+UNMEASURED = nullcontext()
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, input_source=None, seed=None, headless=False, autosave_path=None,
+                 startup_timer=None, telemetry_path=None, hot_reload=False,
+                 memory_profile=False, defer_gc=False, capture_path=None, capture_fps=CAPTURE_FPS):
+        self.headless = headless
+        self.startup_timer = startup_timer or StartupTimer()
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        # Seeding the shared random module makes layout and creature behaviour
+        # reproducible, which record/replay depends on
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+        self.input = input_source if input_source is not None else LiveInput()
+
+        # Only bring up the SDL subsystems the game uses; pygame.init() would
+        # also probe joysticks, cameras and the rest
+        pygame.display.init()
+        pygame.font.init()
         pygame.mixer.init()
+        self.startup_timer.mark('sdl init')
         
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption('Ocean Explorer')
+        self.startup_timer.mark('display')
         
         # Load assets
         self.load_game_assets()
         
+        # Bubbles, answer buttons and effects are recycled through free lists
+        self.bubble_pool = ObjectPool(Bubble)
+        self.button_pool = ObjectPool(AnimatedButton, 16)
+        self.effect_pool = ObjectPool(CelebrationEffect, 16)
+        self.scenes = SceneManager(self, {
+            BUBBLE_GAME: BubbleGame,
+            TREASURE_GAME: TreasureGame,
+            SEASHELL_GAME: SeashellGame,
+            GAME_OVER: GameOver,
+        })
+        
         # Initialize game state
         self.init_game_state()
+        self.autosaver = Autosaver(autosave_path, AUTOSAVE_INTERVAL) if autosave_path else None
+        self.telemetry = Telemetry(telemetry_path, seed) if telemetry_path else None
+        self.hot_reloader = HotReloader(self) if hot_reload else None
+        self.capture = None
+        if capture_path:
+            try:
+                self.capture = FrameCapture(capture_path, self.screen, capture_fps)
+            except (CaptureError, OSError) as e:
+                debug_print(f"Frame capture disabled: {e}", True)
         
         # Start background music
-        if self.background_music:
+        if self.background_music and not headless:
             try:
                 self.background_music.play(-1)
             except:
                 debug_print("Could not play background music", True)
+        self.startup_timer.mark('game state')
+
+        # Everything loaded so far lives for the whole session
+        self.allocations = AllocationTracker() if memory_profile else None
+        self.gc_monitor = GcMonitor() if memory_profile else None
+        self.gc_policy = DeferredGc() if defer_gc else None
+        if self.gc_policy:
+            self.gc_policy.start()
 
     def load_game_assets(self):
         # Load images with proper scaling
-        self.player_img = load_image('player.png', 0.15)
-        self.dolphin_img = load_image('dolphin.png', 0.2)
-        self.turtle_img = load_image('turtle.png', 0.15)
-        self.starfish_img = load_image('starfish.png', 0.1)
-        self.octopus_img = load_image('octopus.png', 0.2)
-        self.fish_img = load_image('fish.png', 0.1)
+        self.player_img = load_image('player.png', PLAYER_IMAGE_SCALE)
+
+        # Creature quizzes, clues and sprites are described in assets/content
+        self.creature_content = load_creature_content()
+        self.creature_images = {
+            entry['name']: load_image(entry['image'], entry['scale']) for entry in self.creature_content
+        }
+        if os.path.isfile(os.path.join('assets', 'images', 'bubble.png')):
+            primitives.set_bubble_image(load_image('bubble.png'))
         
         # Load background
-        self.background_img = load_image('ocean_bg.png')
-        if self.background_img.get_width() != SCREEN_WIDTH or self.background_img.get_height() != SCREEN_HEIGHT:
-            self.background_img = pygame.transform.scale(self.background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background_img = self.load_background()
+        self.caustics = None
+        if not self.headless:
+            self.caustics = CausticsLayer(SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.caustics.start()
+        
+        self.startup_timer.mark('images')
         
         # Load sounds
         self.correct_sound = load_sound('correct.wav')
         self.wrong_sound = load_sound('wrong.wav')
         self.background_music = load_sound('ocean_music.wav')
+        self.startup_timer.mark('sounds')
         
         # Initialize fonts
-        self.font = pygame.font.SysFont('Arial', 24)
-        self.large_font = pygame.font.SysFont('Arial', 32)
-        self.small_font = pygame.font.SysFont('Arial', 18)
+        self.font = load_font(FONT_NAME, 24)
+        self.large_font = load_font(FONT_NAME, 32)
+        self.small_font = load_font(FONT_NAME, 18)
+        self.startup_timer.mark('fonts')
+
+    def load_background(self):
+        background = load_image('ocean_bg.png')
+        if background.get_width() != SCREEN_WIDTH or background.get_height() != SCREEN_HEIGHT:
+            background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        return background
 
     def init_game_state(self):
         self.player = Player(self.player_img)
+        self.other_players = []  # divers of other co-op clients
         self.state = EXPLORE
         self.current_creature = None
         self.answer_buttons = []
@@ -74,6 +161,7 @@ class Game:
         self.min_creature_distance = 200
         self.creatures = self.create_creatures()
         self.clues = self.create_clues()
+        self.first_seen = {}  # creature name -> game time it first came into range
         self.show_collision_circles = False
         self.celebration_effects = []
         
@@ -88,15 +176,31 @@ class Game:
         ]
         
         # Initialize collectibles with fewer bubbles
-        self.bubbles = [Bubble() for _ in range(15)]  # Reduced from 30
+        self.bubbles = [self.bubble_pool.acquire() for _ in range(15)]  # Reduced from 30
         self.bubble_count = 0
         self.last_bubble_spawn = 0
         self.bubble_spawn_delay = 2000  # 2 seconds between spawns
         
         # Initialize game timer
-        self.game_start_time = pygame.time.get_ticks()
+        self.game_start_time = get_ticks()
         self.elapsed_time = 0
 
+        # Mini-games between discoveries; the next one loads in the background
+        self.next_mini_game = 0
+        self.minigame_scores = {}  # best score per mini-game title
+        self.scenes.preload(self.upcoming_scene())
+
+    def reset(self, seed=None):
+        """Start a fresh session on the already loaded assets"""
+        self.seed = seed
+        if seed is not None:
+            random.seed(seed)
+        self.bubble_pool.release_all(self.bubbles)
+        self.button_pool.release_all(self.answer_buttons)
+        self.effect_pool.release_all(self.celebration_effects)
+        self.scenes.reset()
+        self.init_game_state()
+
     def get_random_position(self, existing_positions=None):
         if existing_positions is None:
             existing_positions = []
@@ -117,101 +221,13 @@ class Game:
         return (random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT))
 
     def create_creatures(self):
-        creature_data = [
-            (self.dolphin_img, "Dolphin", [
-                {
-                    "question": "I love to jump and play! What am I?",
-                    "answers": ["A friendly dolphin", "A grumpy shark", "A dancing crab"],
-                    "correct": 0
-                },
-                {
-                    "question": "What special sound power do I have?",
-                    "answers": ["Barking", "Echolocation", "Humming"],
-                    "correct": 1
-                },
-                {
-                    "question": "What's my favorite thing to do?",
-                    "answers": ["Sleep in sand", "Jump and flip", "Hide in rocks"],
-                    "correct": 1
-                }
-            ]),
-            (self.turtle_img, "Sea Turtle", [
-                {
-                    "question": "I carry my home with me! Who am I?",
-                    "answers": ["A hermit crab", "A sea turtle", "A snail"],
-                    "correct": 1
-                },
-                {
-                    "question": "What do I love to eat?",
-                    "answers": ["Seaweed", "Jellyfish", "Fish"],
-                    "correct": 1
-                },
-                {
-                    "question": "How long can I hold my breath?",
-                    "answers": ["1 minute", "5 minutes", "Several hours"],
-                    "correct": 2
-                }
-            ]),
-            (self.starfish_img, "Starfish", [
-                {
-                    "question": "How many arms do I usually have?",
-                    "answers": ["Three", "Four", "Five"],
-                    "correct": 2
-                },
-                {
-                    "question": "What amazing thing can I do if I lose an arm?",
-                    "answers": ["Grow it back", "Swim faster", "Change color"],
-                    "correct": 0
-                },
-                {
-                    "question": "Where do I like to live?",
-                    "answers": ["Deep ocean", "Tide pools", "Rivers"],
-                    "correct": 1
-                }
-            ]),
-            (self.octopus_img, "Octopus", [
-                {
-                    "question": "I'm super smart and have lots of arms!",
-                    "answers": ["An octopus", "A jellyfish", "A seahorse"],
-                    "correct": 0
-                },
-                {
-                    "question": "What's my special hiding trick?",
-                    "answers": ["Become invisible", "Change colors", "Dig in sand"],
-                    "correct": 1
-                },
-                {
-                    "question": "How many arms do I have?",
-                    "answers": ["Four", "Six", "Eight"],
-                    "correct": 2
-                }
-            ]),
-            (self.fish_img, "Tropical Fish", [
-                {
-                    "question": "We swim together in a big group called a...",
-                    "answers": ["School", "Party", "Team"],
-                    "correct": 0
-                },
-                {
-                    "question": "What helps us swim?",
-                    "answers": ["Our fins", "Our tails only", "Magic"],
-                    "correct": 0
-                },
-                {
-                    "question": "Where do we love to live?",
-                    "answers": ["Cold waters", "Warm coral reefs", "Dark caves"],
-                    "correct": 1
-                }
-            ])
-        ]
-        
         creatures = []
         positions = []
         
-        for img, name, questions in creature_data:
+        for entry in self.creature_content:
             x, y = self.get_random_position(positions)
             positions.append((x, y))
-            creatures.append(Creature(x, y, img, name, questions))
+            creatures.append(Creature(x, y, self.creature_images[entry['name']], entry['name'], entry['questions']))
             
         return creatures
         
@@ -220,52 +236,101 @@ class Game:
         clues = []
         positions = [(c.x, c.y) for c in self.creatures]
         
-        clue_data = [
-            ("I've seen splashing and jumping near the surface!", "Dolphin"),
-            ("Look for someone who carries their home everywhere!", "Sea Turtle"),
-            ("I spotted something with five colorful arms!", "Starfish"),
-            ("Something smart with many arms lives here...", "Octopus"),
-            ("Watch for bright colors dancing in the coral!", "Fish")
-        ]
-        
-        for text, creature_hint in clue_data:
+        for entry in self.creature_content:
             x, y = self.get_random_position(positions)
             positions.append((x, y))
-            clues.append(Clue(x, y, text, creature_hint))
+            clues.append(Clue(x, y, entry['clue']['text'], entry['clue']['hint']))
             
         return clues
         
     def setup_quiz(self):
         current_question = self.current_creature.get_next_question()
         if current_question:
-            self.answer_buttons = []
-            for i, answer in enumerate(current_question["answers"]):
-                button = AnimatedButton(
-                    SCREEN_WIDTH // 2 - 125,
-                    350 + i * 60,
-                    250, 50,
-                    answer,
-                    (200, 200, 255)
-                )
-                self.answer_buttons.append(button)
+            self.show_question(current_question)
             return True
         return False
+
+    def show_question(self, question):
+        self.button_pool.release_all(self.answer_buttons)
+        self.answer_buttons = []
+        for i, answer in enumerate(question["answers"]):
+            button = self.button_pool.acquire(
+                SCREEN_WIDTH // 2 - 125,
+                350 + i * 60,
+                250, 50,
+                answer,
+                (200, 200, 255)
+            )
+            self.answer_buttons.append(button)
+
+    def load_save(self, path):
+        """Resume progress from a save state file; returns True on success"""
+        try:
+            load_save_state(self, path)
+        except FileNotFoundError:
+            return False
+        except (OSError, SaveStateError) as e:
+            debug_print(f"Error loading save state {path}: {e}", True)
+            return False
+        debug_print(f"Resumed session from {path}", True)
+        return True
+
+    def track(self, kind, subject='', item=0, value=0, detail=''):
+        """Queue an analytics event stamped with the time since the session started"""
+        if self.telemetry:
+            self.telemetry.record(get_ticks() - self.game_start_time, kind, subject, item, value, detail)
+
+    def upcoming_scene(self, discovered=False):
+        """Scene that follows the next discovery, or the one just made"""
+        remaining = sum(1 for c in self.creatures if not c.visited)
+        if remaining == (0 if discovered else 1):
+            return GAME_OVER
+        return MINI_GAMES[self.next_mini_game % len(MINI_GAMES)]
+
+    def start_scene(self, state):
+        if state in MINI_GAMES:
+            self.next_mini_game += 1
+        self.current_creature = None
+        self.scenes.switch(state)
+        self.state = state
+
+    def end_scene(self):
+        scene = self.scenes.current
+        if scene.name == 'game_over':
+            self.reset()
+            return
+        title = scene.title.rstrip('!')
+        self.minigame_scores[title] = max(scene.score, self.minigame_scores.get(title, 0))
+        self.track('mini_game', scene.name, value=scene.score)
+        self.scenes.exit_current()
+        self.state = EXPLORE
+        self.scenes.preload(self.upcoming_scene())
+
+    @property
+    def scene(self):
+        return self.scenes.current
+
+    def autosave(self, force=False):
+        if self.autosaver:
+            self.autosaver.update(self, force)
         
     def check_answer(self, answer_index):
         current_question = self.current_creature.questions[
             self.current_creature.current_question_index - 1
         ]
+        correct = answer_index == current_question["correct"]
+        self.track('answer', self.current_creature.name,
+                   self.current_creature.current_question_index - 1, answer_index,
+                   'correct' if correct else 'wrong')
         
-        if answer_index == current_question["correct"]:
+        if correct:
             self.celebration_effects.append(
-                CelebrationEffect(self.player.x, self.player.y)
+                self.effect_pool.acquire(self.player.x, self.player.y)
             )
             
             if self.current_creature.current_question_index >= len(self.current_creature.questions):
-                self.current_creature.discovered = True
-                self.current_creature.visited = True
-                self.player.stars += 1
                 self.result_message = f"Amazing! You've discovered something new!"
+                self.discover(self.current_creature)
             else:
                 self.result_message = "Correct! Here's another question..."
                 self.state = QUIZ
@@ -280,92 +345,185 @@ class Game:
                 self.wrong_sound.play()
         
         self.state = REWARD
-        self.result_time = pygame.time.get_ticks()
+        self.result_time = get_ticks()
+
+    def discover(self, creature):
+        creature.discovered = True
+        creature.visited = True
+        self.player.stars += 1
+        self.autosave(force=True)
+        self.track('discover', creature.name,
+                   value=get_ticks() - self.first_seen.get(creature.name, self.game_start_time))
+
+    def move_player(self, player, keys):
+        """Move `player` from held keys and push it along the ocean currents"""
+        dx, dy = 0, 0
+        if keys[K_LEFT] or keys[K_a]:
+            dx = -player.speed
+        if keys[K_RIGHT] or keys[K_d]:
+            dx = player.speed
+        if keys[K_UP] or keys[K_w]:
+            dy = -player.speed
+        if keys[K_DOWN] or keys[K_s]:
+            dy = player.speed
+            
+        if dx != 0 or dy != 0:
+            player.move(dx, dy)
+        
+        # Apply ocean currents
+        for current in self.ocean_currents:
+            dist = math.sqrt(
+                (player.x - current['x'])**2 + 
+                (player.y - current['y'])**2
+            )
+            if dist < current['radius']:
+                force = (1 - dist/current['radius']) * current['strength']
+                angle = math.atan2(player.y - current['y'], 
+                                 player.x - current['x'])
+                player.x += math.cos(angle) * force
+                player.y += math.sin(angle) * force
+        player.rect.center = (player.x, player.y)
+
+    def update_bubbles(self):
+        for bubble in self.bubbles:
+            bubble.update()
+            if bubble.y < -50:  # Reset bubbles that float off screen
+                bubble.y = SCREEN_HEIGHT + random.randint(0, 100)
+                bubble.x = random.randint(50, SCREEN_WIDTH - 50)
+                bubble.popped = False
 
     def update(self):
-        if self.state == EXPLORE:
+        if self.scenes.handles(self.state):
+            self.scenes.update()
+            if self.scenes.current.finished:
+                self.end_scene()
+
+        elif self.state == EXPLORE:
             # Update player position from keyboard input
-            keys = pygame.key.get_pressed()
-            dx, dy = 0, 0
-            if keys[K_LEFT] or keys[K_a]:
-                dx = -self.player.speed
-            if keys[K_RIGHT] or keys[K_d]:
-                dx = self.player.speed
-            if keys[K_UP] or keys[K_w]:
-                dy = -self.player.speed
-            if keys[K_DOWN] or keys[K_s]:
-                dy = self.player.speed
-                
-            if dx != 0 or dy != 0:
-                self.player.move(dx, dy)
-            
-            # Apply ocean currents
-            for current in self.ocean_currents:
-                dist = math.sqrt(
-                    (self.player.x - current['x'])**2 + 
-                    (self.player.y - current['y'])**2
-                )
-                if dist < current['radius']:
-                    force = (1 - dist/current['radius']) * current['strength']
-                    angle = math.atan2(self.player.y - current['y'], 
-                                     self.player.x - current['x'])
-                    self.player.x += math.cos(angle) * force
-                    self.player.y += math.sin(angle) * force
+            self.move_player(self.player, self.input.keys)
             
             # Update creatures
             for creature in self.creatures:
-                creature.update((self.player.x, self.player.y), pygame.mouse.get_pos())
+                creature.update((self.player.x, self.player.y), self.input.mouse_pos)
+                if creature.can_interact and creature.name not in self.first_seen:
+                    self.first_seen[creature.name] = get_ticks()
+            
+            # Update clues
+            for clue in self.clues:
+                was_hovered = clue.is_hovered
+                clue.update(self.input.mouse_pos)
+                if clue.is_hovered and not was_hovered:
+                    self.track('clue_hover', clue.creature_hint)
             
             # Update bubbles
-            for bubble in self.bubbles:
-                bubble.update()
-                if bubble.y < -50:  # Reset bubbles that float off screen
-                    bubble.y = SCREEN_HEIGHT + random.randint(0, 100)
-                    bubble.x = random.randint(50, SCREEN_WIDTH - 50)
-                    bubble.popped = False
+            self.update_bubbles()
         
         elif self.state == QUIZ:
-            mouse_pos = pygame.mouse.get_pos()
-            for button in self.answer_buttons:
-                button.update()
-                button.check_hover(mouse_pos)
+            self.update_buttons()
                 
-        # Update celebration effects
-        for effect in self.celebration_effects[:]:
+        self.update_effects()
+
+    def update_buttons(self):
+        mouse_pos = self.input.mouse_pos
+        for button in self.answer_buttons:
+            button.update(mouse_pos)
+            button.check_hover(mouse_pos)
+
+    def update_effects(self):
+        # Update celebration effects, walking backwards so finished ones can
+        # be removed in place and handed back to the pool
+        effects = self.celebration_effects
+        for i in range(len(effects) - 1, -1, -1):
+            effect = effects[i]
             effect.update()
             if not effect.alive:
-                self.celebration_effects.remove(effect)
+                del effects[i]
+                self.effect_pool.release(effect)
+
+    def memory_stats(self):
+        """Per-entity instance sizes, pool usage and GC collection counts"""
+        samples = [self.player] + self.creatures[:1] + self.bubbles[:1] + self.clues[:1] + \
+            self.answer_buttons[:1] + self.celebration_effects[:1]
+        return {
+            'entity_bytes': {type(obj).__name__: instance_size(obj) for obj in samples},
+            'pools': {
+                'bubbles': self.bubble_pool.stats(),
+                'buttons': self.button_pool.stats(),
+                'effects': self.effect_pool.stats(),
+            },
+            'gc_collections': gc_collections(),
+        }
+
+    @property
+    def current_question(self):
+        if self.current_creature is None or self.current_creature.current_question_index == 0:
+            return None
+        return self.current_creature.questions[self.current_creature.current_question_index - 1]
 
     def draw(self):
-        # Draw background
-        self.screen.blit(self.background_img, (0, 0))
+        self.render(self)
+        pygame.display.flip()
+        if self.capture:
+            self.capture.grab(self.screen)
+
+    @staticmethod
+    def current_surface(radius):
+        surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (0, 100, 255, 50), (radius, radius), radius)
+        return surf
+
+    @staticmethod
+    def overlay_surface():
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))
+        return overlay
+
+    def render(self, frame):
+        """Draw one frame of dynamic state from `frame`.
+
+        `frame` is either the game itself or a FrameSnapshot published by the
+        simulation thread; both expose the same attribute names.
+        """
+        if self.hot_reloader:
+            self.hot_reloader.apply_render()
+        # Draw background, with the caustics loop once it has been generated
+        background = self.caustics.compose(self.background_img) if self.caustics else self.background_img
+        self.screen.blit(background, (0, 0))
+
+        # Mini-games and the game over screen draw themselves
+        if frame.scene is not None:
+            frame.scene.draw(self.screen)
+            for effect in frame.celebration_effects:
+                effect.draw(self.screen)
+            return
         
         # Draw ocean currents (subtle visualization)
-        for current in self.ocean_currents:
-            surf = pygame.Surface((current['radius']*2, current['radius']*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (0, 100, 255, 50), 
-                             (current['radius'], current['radius']), 
-                             current['radius'])
+        for current in frame.ocean_currents:
+            surf = primitives.cached(('current', current['radius']), lambda: self.current_surface(current['radius']))
             self.screen.blit(surf, (current['x'] - current['radius'], 
                                   current['y'] - current['radius']))
         
         # Draw bubbles
-        for bubble in self.bubbles:
+        for bubble in frame.bubbles:
             bubble.draw(self.screen)
         
+        # Draw clues
+        for clue in frame.clues:
+            clue.draw(self.screen, self.font)
+        
         # Draw creatures
-        for creature in self.creatures:
+        for creature in frame.creatures:
             creature.draw(self.screen, self.font)
         
         # Draw player
-        self.player.draw(self.screen)
+        for player in frame.other_players:
+            player.draw(self.screen)
+        frame.player.draw(self.screen)
         
         # Draw quiz state
-        if self.state == QUIZ:
+        if frame.state == QUIZ:
             # Draw semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(primitives.cached('overlay', self.overlay_surface), (0, 0))
             
             # Draw question box
             question_box = pygame.Rect(SCREEN_WIDTH // 2 - 300, 150, 600, 150)
@@ -373,21 +531,16 @@ class Game:
             pygame.draw.rect(self.screen, BLACK, question_box, 2, border_radius=15)
             
             # Draw current question
-            current_question = self.current_creature.questions[
-                self.current_creature.current_question_index - 1
-            ]
-            question_text = self.font.render(current_question["question"], True, BLACK)
+            question_text = self.font.render(frame.current_question["question"], True, BLACK)
             self.screen.blit(question_text, (SCREEN_WIDTH // 2 - question_text.get_width() // 2, 220))
             
             # Draw answer buttons
-            for button in self.answer_buttons:
+            for button in frame.answer_buttons:
                 button.draw(self.screen, self.font)
         
         # Draw reward state
-        elif self.state == REWARD:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))
-            self.screen.blit(overlay, (0, 0))
+        elif frame.state == REWARD:
+            self.screen.blit(primitives.cached('overlay', self.overlay_surface), (0, 0))
             
             result_box = pygame.Rect(SCREEN_WIDTH // 2 - 250, SCREEN_HEIGHT // 2 - 150, 500, 300)
             shadow_box = result_box.copy()
@@ -397,7 +550,7 @@ class Game:
             pygame.draw.rect(self.screen, WHITE, result_box, border_radius=15)
             
             # Draw result message with word wrap
-            words = self.result_message.split()
+            words = frame.result_message.split()
             lines = []
             current_line = []
             for word in words:
@@ -423,54 +576,131 @@ class Game:
             self.screen.blit(continue_text, continue_rect)
         
         # Draw celebration effects
-        for effect in self.celebration_effects:
+        for effect in frame.celebration_effects:
             effect.draw(self.screen)
         
-        pygame.display.flip()
-        
-    def run(self):
-        running = True
-        while running:
-            self.clock.tick(60)
+    def handle_event(self, event):
+        """Apply one input event; returns False when the game should quit"""
+        if event.type == QUIT:
+            return False
+        elif self.scenes.handles(self.state):
+            self.scenes.handle_event(event)
+        elif event.type == MOUSEBUTTONDOWN:
+            mouse_pos = self.input.mouse_pos
             
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == QUIT:
+            if self.state == EXPLORE:
+                # Check creature interactions
+                for creature in self.creatures:
+                    if not creature.visited and creature.can_interact and creature.is_hovered:
+                        self.current_creature = creature
+                        self.state = QUIZ
+                        self.setup_quiz()
+                        break
+                        
+                # Check bubble pops
+                for bubble in self.bubbles:
+                    if bubble.check_pop(mouse_pos):
+                        self.bubble_count += 1
+                        self.track('bubble_pop', value=bubble.size)
+                        
+            elif self.state == QUIZ:
+                for i, button in enumerate(self.answer_buttons):
+                    if button.is_clicked(mouse_pos, event):
+                        self.check_answer(i)
+                        break
+                        
+            elif self.state == REWARD:
+                if self.current_creature and not self.current_creature.visited:
+                    self.state = QUIZ
+                    self.setup_quiz()
+                elif self.current_creature and self.current_creature.discovered:
+                    self.start_scene(self.upcoming_scene(discovered=True))
+                else:
+                    self.state = EXPLORE
+                    self.current_creature = None
+        return True
+
+    def step(self):
+        """Advance the simulation by one tick; returns False once the game should quit"""
+        self.start_frame()
+        running = True
+        with self.phase('input'):
+            if self.hot_reloader:
+                self.hot_reloader.poll()
+            for event in self.input.poll():
+                if not self.handle_event(event):
                     running = False
-                elif event.type == MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    
-                    if self.state == EXPLORE:
-                        # Check creature interactions
-                        for creature in self.creatures:
-                            if not creature.visited and creature.can_interact and creature.is_hovered:
-                                self.current_creature = creature
-                                self.state = QUIZ
-                                self.setup_quiz()
-                                break
-                                
-                        # Check bubble pops
-                        for bubble in self.bubbles:
-                            if bubble.check_pop(mouse_pos):
-                                self.bubble_count += 1
-                                
-                    elif self.state == QUIZ:
-                        for i, button in enumerate(self.answer_buttons):
-                            if button.is_clicked(mouse_pos, event):
-                                self.check_answer(i)
-                                break
-                                
-                    elif self.state == REWARD:
-                        if self.current_creature and not self.current_creature.visited:
-                            self.state = QUIZ
-                            self.setup_quiz()
-                        else:
-                            self.state = EXPLORE
-                            self.current_creature = None
-            
+        with self.phase('update'):
             self.update()
-            self.draw()
+        return running
+
+    def phase(self, name):
+        """Context for one phase of a frame, measured when memory profiling is on"""
+        return self.allocations.phase(name) if self.allocations else UNMEASURED
+
+    def start_frame(self):
+        if self.allocations:
+            self.allocations.end_frame()
+        if self.gc_policy:
+            # Collections wait for a frame where a pause goes unnoticed
+            self.gc_policy.end_frame(self.state in (QUIZ, REWARD) or self.is_static())
+        
+    def is_static(self):
+        """True while nothing on screen moves until the player does something"""
+        if self.celebration_effects:
+            return False
+        if self.state in (REWARD, GAME_OVER):
+            return True
+        # A mini-game showing its results
+        return getattr(self.scene, 'ended', None) is not None
+
+    def run(self, pacer=None):
+        """Main loop; with a FramePacer the frame rate drops while nobody is playing"""
+        running = True
+        first_frame = True
+        while running:
+            if pacer:
+                pacer.wait()
+            else:
+                self.clock.tick(FPS)
+            running = self.step()
+            with self.phase('autosave'):
+                self.autosave()
+            if pacer is None or pacer.update(self):
+                with self.phase('draw'):
+                    self.draw()
+            if first_frame:
+                first_frame = False
+                self.first_frame_done()
             
+        if pacer:
+            pacer.print_summary()
+        self.shutdown()
+
+    def first_frame_done(self):
+        self.startup_timer.mark('first frame')
+        if not self.headless:
+            self.startup_timer.report()
+
+    def shutdown(self):
+        self.autosave(force=True)
+        if self.autosaver:
+            self.autosaver.close()
+        if self.telemetry:
+            self.track('session_end', value=self.player.stars)
+            self.telemetry.close()
+        self.input.close()
+        self.scenes.close()
+        if self.capture:
+            self.capture.close()
+        if self.allocations or self.gc_policy:
+            print_report(self.allocations, self.gc_monitor, self.gc_policy)
+        if self.allocations:
+            self.allocations.close()
+        if self.gc_monitor:
+            self.gc_monitor.close()
+        if self.gc_policy:
+            self.gc_policy.stop()
         pygame.quit()
         sys.exit()
 
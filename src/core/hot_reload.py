@@ -0,0 +1,133 @@
+"""
+Swaps edited assets and content into a running game.
+
+Images and sounds are reloaded through the loader and replaced on the live
+objects that use them; editing creatures.json replaces each creature's
+questions and clue text. Positions, progress and scores are left alone.
+
+poll() runs with the simulation. The sprite caches belong to whichever
+thread renders, so changes to them are queued and made by apply_render()
+at the start of the next render.
+"""
+import os
+from collections import deque
+
+from ..utils.constants import PLAYER_IMAGE_SCALE, QUIZ
+from ..utils.debug import debug_print
+from ..utils.loader import load_image, load_sound, load_creature_content, ContentError
+from ..utils.sprites import primitives, transforms
+from ..utils.collision import masks
+from ..utils.watcher import FileWatcher
+
+ASSETS_DIR = 'assets'
+
+class HotReloader:
+    def __init__(self, game, interval=1.0):
+        self.game = game
+        self.watcher = FileWatcher([ASSETS_DIR], interval)
+        self.reloads = 0
+        self.render_tasks = deque()  # appended by poll(), run by apply_render()
+
+    def apply_render(self):
+        """Make the queued sprite cache changes; call from the render thread"""
+        tasks = self.render_tasks
+        while tasks:
+            tasks.popleft()()
+
+    def poll(self):
+        for path in self.watcher.poll():
+            kind, _, name = os.path.relpath(path, ASSETS_DIR).replace(os.sep, '/').partition('/')
+            if kind == 'images':
+                self.reload_image(name)
+            elif kind == 'sounds':
+                self.reload_sound(name)
+            elif kind == 'content' and name == 'creatures.json':
+                if not self.reload_content():
+                    continue
+            else:
+                continue
+            self.reloads += 1
+            debug_print(f"Reloaded {path}", True)
+
+    def reload_image(self, name):
+        game = self.game
+        if name == 'player.png':
+            game.player_img = load_image(name, PLAYER_IMAGE_SCALE)
+            for player in [game.player] + list(game.other_players):
+                player.image = game.player_img
+                player.rect = game.player_img.get_rect(center=(player.x, player.y))
+        elif name == 'ocean_bg.png':
+            game.background_img = game.load_background()
+        elif name == 'bubble.png':
+            image = load_image(name)
+            self.render_tasks.append(lambda: primitives.set_bubble_image(image))
+        else:
+            for entry in game.creature_content:
+                if entry['image'] == name:
+                    self.swap_creature_image(entry)
+        # Rotated copies and masks of the old sprites are no longer any use.
+        # Masks are only used by the simulation, so they can go now.
+        self.render_tasks.append(transforms.clear)
+        masks.clear()
+
+    def swap_creature_image(self, entry):
+        game = self.game
+        image = load_image(entry['image'], entry['scale'])
+        game.creature_images[entry['name']] = image
+        for creature in game.creatures:
+            if creature.name == entry['name']:
+                creature.image = image
+                creature.rect = image.get_rect(center=(creature.x, creature.y))
+
+    def reload_sound(self, name):
+        game = self.game
+        attribute = {
+            'correct.wav': 'correct_sound',
+            'wrong.wav': 'wrong_sound',
+            'ocean_music.wav': 'background_music',
+        }.get(name)
+        if attribute is None:
+            return
+        old = getattr(game, attribute)
+        sound = load_sound(name)
+        setattr(game, attribute, sound)
+        if attribute == 'background_music' and old is not None and old.get_num_channels():
+            old.stop()
+            if sound is not None:
+                sound.play(-1)
+
+    def reload_content(self):
+        game = self.game
+        try:
+            content = load_creature_content()
+        except ContentError as e:
+            debug_print(f"{e}; keeping the previous content", True)
+            return False
+
+        old_content = game.creature_content
+        old_entries = {entry['name']: entry for entry in old_content}
+        entries = {entry['name']: entry for entry in content}
+        if entries.keys() != old_entries.keys():
+            debug_print("Creatures were added or removed; that takes effect on the next game", True)
+        game.creature_content = content
+        for entry in content:
+            old = old_entries.get(entry['name'])
+            if old is None or (entry['image'], entry['scale']) != (old['image'], old['scale']):
+                self.swap_creature_image(entry)
+
+        for creature in game.creatures:
+            entry = entries.get(creature.name)
+            if entry is not None:
+                creature.questions = entry['questions']
+                creature.current_question_index = min(creature.current_question_index, len(entry['questions']))
+        # Clues were made in the same order as the creatures
+        for clue, creature in zip(game.clues, game.creatures):
+            entry = entries.get(creature.name)
+            if entry is not None:
+                clue.text = entry['clue']['text']
+                clue.creature_hint = entry['clue']['hint']
+
+        # Redraw an open question with its new wording
+        if game.state == QUIZ and game.current_question is not None:
+            game.show_question(game.current_question)
+        return True
@@ -0,0 +1,57 @@
+import threading
+import pygame
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() built from a set of held keys"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class LiveInput:
+    """Reads events, held keys and the mouse position from pygame once per tick"""
+    def __init__(self):
+        self.events = []
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+
+    def poll(self):
+        self.events = pygame.event.get()
+        self.keys = pygame.key.get_pressed()
+        self.mouse_pos = pygame.mouse.get_pos()
+        return self.events
+
+    def close(self):
+        pass
+
+class QueuedInput:
+    """Input source fed by another thread.
+
+    The thread that owns the window pushes events and device state with
+    push(); the simulation thread takes everything queued so far in poll().
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = []
+        self.latest_keys = KeyState()
+        self.latest_mouse_pos = (0, 0)
+        self.events = []
+        self.keys = self.latest_keys
+        self.mouse_pos = self.latest_mouse_pos
+
+    def push(self, events, keys, mouse_pos):
+        with self.lock:
+            self.pending.extend(events)
+            self.latest_keys = keys
+            self.latest_mouse_pos = mouse_pos
+
+    def poll(self):
+        with self.lock:
+            self.events, self.pending = self.pending, []
+            self.keys = self.latest_keys
+            self.mouse_pos = self.latest_mouse_pos
+        return self.events
+
+    def close(self):
+        pass
@@ -0,0 +1,127 @@
+"""
+Adaptive frame pacing for the main loop.
+
+The game runs at full rate while it is being played. After a while with
+no input it only redraws at IDLE_FPS; the simulation keeps stepping at
+full rate, so creatures and bubbles still move at their normal speed. On
+screens where nothing moves until the player acts it drops to STATIC_FPS
+and stops redrawing. The static tier waits on the event queue rather than
+sleeping, so the first input wakes the loop straight back to full rate.
+"""
+import time
+import pygame
+
+from .replay import TRACKED_KEYS
+from ..utils.constants import FPS
+from ..utils.debug import debug_print
+
+ACTIVE = 'active'
+IDLE = 'idle'
+STATIC = 'static'
+
+IDLE_FPS = 20
+STATIC_FPS = 4
+IDLE_AFTER = 15.0   # seconds without input before dropping to IDLE_FPS
+STATIC_AFTER = 0.5  # seconds without input on a static screen before STATIC_FPS
+REPORT_INTERVAL = 60.0
+
+class FramePacer:
+    def __init__(self, fps=FPS, idle_fps=IDLE_FPS, static_fps=STATIC_FPS,
+                 idle_after=IDLE_AFTER, static_after=STATIC_AFTER):
+        self.rates = {ACTIVE: fps, IDLE: idle_fps, STATIC: static_fps}
+        self.idle_after = idle_after
+        self.static_after = static_after
+        self.clock = pygame.time.Clock()
+        self.tier = ACTIVE
+        self.last_input = time.monotonic()
+        self.static_drawn = False
+        self.last_draw = 0.0
+        self.frames = 0
+        self.draws = 0
+
+        # CPU accounting, reported once a minute
+        self.tier_seconds = dict.fromkeys(self.rates, 0.0)
+        self.cpu_per_minute = []
+        self.started = self.period_start = self.last_frame = time.monotonic()
+        self.cpu_start = self.period_cpu = time.process_time()
+
+    def wait(self):
+        """Block until the next frame is due"""
+        if self.tier != STATIC:
+            # Idle frames still step at full rate; only their draws are skipped
+            self.clock.tick(self.rates[ACTIVE])
+            return
+        # Sleep on the event queue so input ends the wait at once, then put
+        # the event back for the input source to read
+        event = pygame.event.wait(1000 // self.rates[self.tier])
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+        self.clock.tick()
+
+    def update(self, game):
+        """Choose the tier for the next frame from the one just simulated.
+
+        Returns whether this frame needs drawing.
+        """
+        now = time.monotonic()
+        self.frames += 1
+        self.tier_seconds[self.tier] += now - self.last_frame
+        self.last_frame = now
+
+        source = game.input
+        if source.events or any(source.keys[key] for key in TRACKED_KEYS):
+            self.last_input = now
+        quiet = now - self.last_input
+
+        if quiet >= self.static_after and game.is_static():
+            tier = STATIC
+        elif quiet >= self.idle_after:
+            tier = IDLE
+        else:
+            tier = ACTIVE
+        if tier != self.tier:
+            debug_print(f"Frame pacing: {self.tier} -> {tier}")
+            self.tier = tier
+
+        if tier == STATIC:
+            # A static screen only needs drawing once
+            draw = not self.static_drawn
+        elif tier == IDLE:
+            # Half a frame of slack keeps clock jitter from skipping an extra frame
+            draw = now - self.last_draw >= 1 / self.rates[IDLE] - 0.5 / self.rates[ACTIVE]
+        else:
+            draw = True
+        self.static_drawn = tier == STATIC
+        if draw:
+            self.draws += 1
+            self.last_draw = now
+
+        if now - self.period_start >= REPORT_INTERVAL:
+            self.report_minute(game, now)
+        return draw
+
+    def report_minute(self, game, now):
+        cpu = time.process_time()
+        per_minute = (cpu - self.period_cpu) * 1000 * 60 / (now - self.period_start)
+        self.cpu_per_minute.append(per_minute)
+        game.track('cpu_minute', self.tier, value=int(per_minute))
+        debug_print(f"CPU time: {per_minute:.0f} ms per minute ({self.tier})")
+        self.period_start = now
+        self.period_cpu = cpu
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        cpu = time.process_time() - self.cpu_start
+        return {
+            'minutes': round(elapsed / 60, 2),
+            'cpu_ms_per_minute': round(cpu * 1000 * 60 / elapsed),
+            'frames': self.frames,
+            'draws': self.draws,
+            'seconds_per_tier': {tier: round(s, 1) for tier, s in self.tier_seconds.items()},
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        tiers = ', '.join(f"{tier} {s}s" for tier, s in summary['seconds_per_tier'].items())
+        debug_print(f"Frame pacing: {summary['cpu_ms_per_minute']} ms CPU per minute over "
+                    f"{summary['minutes']} min; {summary['draws']} of {summary['frames']} frames drawn ({tiers})", True)
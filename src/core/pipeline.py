@@ -0,0 +1,131 @@
+"""
+Two-stage game loop: a simulation thread advances the game and publishes
+immutable frame snapshots, while the main thread owns the window, pumps
+input and renders the newest snapshot.
+"""
+import copy
+import threading
+from collections import namedtuple
+import pygame
+
+from ..utils.constants import FPS
+from ..utils.snapshot import detach
+
+# Mirrors the Game attributes that Game.render() reads, so render() works on
+# either the live game or a snapshot
+FrameSnapshot = namedtuple('FrameSnapshot', [
+    'state', 'ocean_currents', 'bubbles', 'clues', 'creatures', 'player',
+    'other_players', 'current_question', 'answer_buttons', 'result_message', 'celebration_effects',
+    'scene'
+])
+
+def _detach_effect(effect):
+    clone = copy.copy(effect)
+    clone.particles = [copy.copy(p) for p in effect.particles if p.life > 0]
+    return clone
+
+def take_snapshot(game):
+    """Copy everything render() needs out of `game` into a FrameSnapshot"""
+    return FrameSnapshot(
+        state=game.state,
+        ocean_currents=tuple(game.ocean_currents),
+        bubbles=tuple(detach(b) for b in game.bubbles if not b.popped),
+        clues=tuple(detach(c) for c in game.clues if not c.collected),
+        creatures=tuple(detach(c) for c in game.creatures if not c.visited),
+        player=detach(game.player),
+        other_players=tuple(detach(p) for p in game.other_players),
+        current_question=game.current_question,
+        answer_buttons=tuple(detach(b) for b in game.answer_buttons),
+        result_message=game.result_message,
+        celebration_effects=tuple(_detach_effect(e) for e in game.celebration_effects),
+        scene=game.scenes.snapshot(),
+    )
+
+class SnapshotBuffer:
+    """Double buffer of snapshots.
+
+    The simulation thread fills the back slot and swaps it to the front; the
+    render thread reads the front slot, waiting for a newer one if needed.
+    """
+    def __init__(self):
+        self.slots = [None, None]
+        self.front = 0
+        self.sequence = 0
+        self.condition = threading.Condition()
+
+    def publish(self, snapshot):
+        back = 1 - self.front
+        self.slots[back] = snapshot
+        with self.condition:
+            self.front = back
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def wait_newer(self, sequence, timeout):
+        """Return (sequence, snapshot), waiting up to `timeout` for one newer than `sequence`"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence != sequence, timeout)
+            return self.sequence, self.slots[self.front]
+
+class PipelinedRunner:
+    """Runs `game` with simulation and rendering on separate threads.
+
+    `feed` is the QueuedInput the game polls; the main thread pushes window
+    input into it. Without a feed (e.g. when replaying) window events are
+    only pumped to keep the window responsive.
+    """
+    def __init__(self, game, feed=None):
+        self.game = game
+        self.feed = feed
+        self.buffer = SnapshotBuffer()
+        self.running = True
+        self.error = None
+
+    def simulate(self):
+        game = self.game
+        clock = pygame.time.Clock()
+        try:
+            while self.running:
+                clock.tick(FPS)
+                if not game.step():
+                    self.running = False
+                game.autosave()
+                self.buffer.publish(take_snapshot(game))
+        except BaseException as e:
+            self.error = e
+            self.running = False
+        finally:
+            # Wake the render thread so it notices we stopped
+            self.buffer.publish(self.buffer.slots[self.buffer.front])
+
+    def run(self):
+        game = self.game
+        thread = threading.Thread(target=self.simulate, name='simulation', daemon=True)
+        thread.start()
+
+        rendered = 0
+        first_frame = True
+        while self.running:
+            sequence, snapshot = self.buffer.wait_newer(rendered, 1 / FPS)
+
+            events = pygame.event.get()
+            if self.feed is not None:
+                self.feed.push(events, pygame.key.get_pressed(), pygame.mouse.get_pos())
+
+            if sequence != rendered and snapshot is not None:
+                rendered = sequence
+                game.render(snapshot)
+                pygame.display.flip()
+                if game.capture:
+                    game.capture.grab(game.screen)
+                if first_frame:
+                    first_frame = False
+                    game.first_frame_done()
+
+        thread.join()
+        if self.error is not None:
+            raise self.error
+        game.shutdown()
+
+def run_pipelined(game, feed=None):
+    PipelinedRunner(game, feed).run()
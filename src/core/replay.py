@@ -0,0 +1,197 @@
+import struct
+import time
+import random
+import pygame
+
+from .input import KeyState
+from ..utils.constants import FPS
+from ..utils.debug import debug_print
+from ..utils.timing import FrameClock, set_time_source
+
+# File layout (little endian):
+#   header: magic, format version, random seed
+#   per tick: mouse x, mouse y, held-key bitmask, event count, then the events
+#   per event: kind byte followed by a kind-specific payload
+MAGIC = b'OERP'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+TICK = struct.Struct('<hhBB')
+MOUSE_EVENT = struct.Struct('<hhB')
+KEY_EVENT = struct.Struct('<i')
+
+EVENT_QUIT = 0
+EVENT_MOUSEBUTTONDOWN = 1
+EVENT_KEYDOWN = 2
+
+# Only the keys the game polls are recorded; their bit is their index here
+TRACKED_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s
+)
+
+class ReplayError(Exception):
+    pass
+
+def new_seed():
+    return random.randrange(2 ** 32)
+
+class InputRecorder:
+    """Wraps an input source and writes every tick it produces to a file.
+
+    Installs a frame clock so the recorded session runs on the same
+    deterministic time base the replay will use.
+    """
+    def __init__(self, source, path, seed):
+        self.source = source
+        self.seed = seed
+        self.clock = FrameClock()
+        set_time_source(self.clock)
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.ticks = 0
+
+    @property
+    def events(self):
+        return self.source.events
+
+    @property
+    def keys(self):
+        return self.source.keys
+
+    @property
+    def mouse_pos(self):
+        return self.source.mouse_pos
+
+    def poll(self):
+        if self.ticks:
+            self.clock.advance()
+        events = self.source.poll()
+        self.write_tick(events)
+        return events
+
+    def write_tick(self, events):
+        keys = self.source.keys
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+
+        payload = []
+        for event in events:
+            if event.type == pygame.QUIT:
+                payload.append(bytes((EVENT_QUIT,)))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                payload.append(bytes((EVENT_MOUSEBUTTONDOWN,)) +
+                               MOUSE_EVENT.pack(event.pos[0], event.pos[1], event.button))
+            elif event.type == pygame.KEYDOWN:
+                payload.append(bytes((EVENT_KEYDOWN,)) + KEY_EVENT.pack(event.key))
+
+        x, y = self.source.mouse_pos
+        self.file.write(TICK.pack(x, y, mask, len(payload)))
+        self.file.write(b''.join(payload))
+        self.ticks += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            debug_print(f"Recorded {self.ticks} ticks (seed {self.seed})", True)
+        set_time_source(None)
+        self.source.close()
+
+class ReplayInput:
+    """Input source that plays back a recording made by InputRecorder.
+
+    Once the recording runs out it emits a QUIT event so the game loop stops.
+    With `pump_window`, poll() also drains the window's own events so it
+    keeps responding; closing the window ends the replay.
+    """
+    def __init__(self, path, pump_window=False):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        if len(self.data) < HEADER.size:
+            raise ReplayError(f"Recording is too short: {path}")
+        magic, version, self.seed = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ReplayError(f"Not an Ocean Explorer recording: {path}")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported recording version {version}: {path}")
+
+        self.offset = HEADER.size
+        self.pump_window = pump_window
+        self.clock = FrameClock()
+        set_time_source(self.clock)
+        self.events = []
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+        self.ticks = 0
+        self.finished = False
+
+    def poll(self):
+        if self.ticks:
+            self.clock.advance()
+        if self.pump_window and any(event.type == pygame.QUIT for event in pygame.event.get()):
+            self.offset = len(self.data)
+        if self.offset >= len(self.data):
+            self.finished = True
+            self.events = [pygame.event.Event(pygame.QUIT)]
+            return self.events
+
+        x, y, mask, count = TICK.unpack_from(self.data, self.offset)
+        self.offset += TICK.size
+        self.mouse_pos = (x, y)
+        self.keys = KeyState(key for bit, key in enumerate(TRACKED_KEYS) if mask & (1 << bit))
+
+        events = []
+        for _ in range(count):
+            kind = self.data[self.offset]
+            self.offset += 1
+            if kind == EVENT_QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+            elif kind == EVENT_MOUSEBUTTONDOWN:
+                ex, ey, button = MOUSE_EVENT.unpack_from(self.data, self.offset)
+                self.offset += MOUSE_EVENT.size
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(ex, ey), button=button))
+            elif kind == EVENT_KEYDOWN:
+                key, = KEY_EVENT.unpack_from(self.data, self.offset)
+                self.offset += KEY_EVENT.size
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+            else:
+                raise ReplayError(f"Corrupt recording: unknown event kind {kind}")
+
+        self.events = events
+        self.ticks += 1
+        return events
+
+    def close(self):
+        set_time_source(None)
+
+def replay_session(path, render=True):
+    """Replay a recording headlessly as fast as possible and return a summary"""
+    from .game import Game
+
+    source = ReplayInput(path)
+    game = Game(input_source=source, seed=source.seed, headless=True)
+
+    frame_times = []
+    start = time.perf_counter()
+    running = True
+    while running:
+        frame_start = time.perf_counter()
+        running = game.step()
+        if render:
+            game.draw()
+        frame_times.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    source.close()
+
+    frame_times.sort()
+    return {
+        'ticks': source.ticks,
+        'seed': source.seed,
+        'stars': game.player.stars,
+        'bubbles_popped': game.bubble_count,
+        'seconds': elapsed,
+        'frame_ms_p50': frame_times[len(frame_times) // 2] * 1000,
+        'frame_ms_max': frame_times[-1] * 1000,
+        'simulated_seconds': source.ticks / FPS,
+    }
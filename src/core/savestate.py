@@ -0,0 +1,245 @@
+import os
+import struct
+import threading
+from array import array
+
+from ..utils.constants import BUBBLE_COLORS, EXPLORE, QUIZ, REWARD, GAME_OVER
+from ..utils.debug import debug_print
+from ..utils.timing import get_ticks
+
+# Snapshot layout (little endian):
+#   header:    magic, format version
+#   game:      state, index of the current creature (255 = none), bubble count,
+#              elapsed game time in ms, result message length + utf-8 bytes
+#   mini-games: index of the next one, count, then per title name length +
+#              utf-8 title, best score
+#   player:    x, y, stars
+#   creatures: count, then per creature name length + utf-8 name, question
+#              index, flags, x, y, original x, original y
+#   bubbles:   count, then array('f') of x/y/speed and array('B') of
+#              size/colour index/popped
+#   currents:  count, then array('f') of x/y/strength/radius
+MAGIC = b'OESV'
+VERSION = 2
+HEADER = struct.Struct('<4sH')
+GAME = struct.Struct('<BBII')
+PLAYER = struct.Struct('<ffH')
+CREATURE = struct.Struct('<BBffff')
+COUNT = struct.Struct('<H')
+NAME = struct.Struct('<B')
+SCORE = struct.Struct('<I')
+
+VISITED = 1
+DISCOVERED = 2
+
+class SaveStateError(Exception):
+    pass
+
+def _pack_text(text, length_struct):
+    data = text.encode('utf-8')
+    return length_struct.pack(len(data)) + data
+
+def capture(game):
+    """Pack the session progress of `game` into a bytes snapshot"""
+    current_index = game.creatures.index(game.current_creature) if game.current_creature in game.creatures else 255
+    parts = [
+        HEADER.pack(MAGIC, VERSION),
+        GAME.pack(game.state, current_index, game.bubble_count, get_ticks() - game.game_start_time),
+        _pack_text(game.result_message, COUNT),
+        COUNT.pack(game.next_mini_game),
+        COUNT.pack(len(game.minigame_scores)),
+    ]
+    for title, score in game.minigame_scores.items():
+        parts.append(_pack_text(title, NAME))
+        parts.append(SCORE.pack(score))
+    parts += [
+        PLAYER.pack(game.player.x, game.player.y, game.player.stars),
+        COUNT.pack(len(game.creatures)),
+    ]
+    for creature in game.creatures:
+        flags = (VISITED if creature.visited else 0) | (DISCOVERED if creature.discovered else 0)
+        parts.append(_pack_text(creature.name, NAME))
+        parts.append(CREATURE.pack(creature.current_question_index, flags,
+                                   creature.x, creature.y, creature.original_x, creature.original_y))
+
+    motion = array('f')
+    looks = array('B')
+    for bubble in game.bubbles:
+        motion.extend((bubble.x, bubble.y, bubble.speed))
+        looks.extend((bubble.size, BUBBLE_COLORS.index(bubble.color), bubble.popped))
+    parts.append(COUNT.pack(len(game.bubbles)))
+    parts.append(motion.tobytes())
+    parts.append(looks.tobytes())
+
+    currents = array('f')
+    for current in game.ocean_currents:
+        currents.extend((current['x'], current['y'], current['strength'], current['radius']))
+    parts.append(COUNT.pack(len(game.ocean_currents)))
+    parts.append(currents.tobytes())
+    return b''.join(parts)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def text(self, length_struct):
+        length, = self.unpack(length_struct)
+        text = self.data[self.offset:self.offset + length].decode('utf-8')
+        self.offset += length
+        return text
+
+    def array(self, typecode, count):
+        values = array(typecode)
+        end = self.offset + count * values.itemsize
+        values.frombytes(self.data[self.offset:end])
+        self.offset = end
+        return values
+
+def restore(game, data):
+    """Apply a snapshot made by capture() to a freshly initialised game"""
+    try:
+        _restore(game, _Reader(data))
+    except (struct.error, ValueError, IndexError) as e:
+        raise SaveStateError(f"Corrupt save state: {e}")
+
+def _restore(game, reader):
+    magic, version = reader.unpack(HEADER)
+    if magic != MAGIC:
+        raise SaveStateError("Not an Ocean Explorer save state")
+    if version != VERSION:
+        raise SaveStateError(f"Unsupported save state version {version}")
+
+    state, current_index, game.bubble_count, elapsed = reader.unpack(GAME)
+    game.result_message = reader.text(COUNT)
+    game.game_start_time = get_ticks() - elapsed
+
+    game.next_mini_game, = reader.unpack(COUNT)
+    count, = reader.unpack(COUNT)
+    game.minigame_scores = {}
+    for _ in range(count):
+        title = reader.text(NAME)
+        game.minigame_scores[title], = reader.unpack(SCORE)
+
+    x, y, game.player.stars = reader.unpack(PLAYER)
+    game.player.x = x
+    game.player.y = y
+    game.player.rect.center = (x, y)
+
+    by_name = {creature.name: creature for creature in game.creatures}
+    count, = reader.unpack(COUNT)
+    for _ in range(count):
+        name = reader.text(NAME)
+        index, flags, x, y, original_x, original_y = reader.unpack(CREATURE)
+        creature = by_name.get(name)
+        if creature is None:
+            # Content changed since the save was written; skip what's gone
+            continue
+        creature.current_question_index = min(index, len(creature.questions))
+        creature.visited = bool(flags & VISITED)
+        creature.discovered = bool(flags & DISCOVERED)
+        creature.x, creature.y = x, y
+        creature.original_x, creature.original_y = original_x, original_y
+        creature.target_x, creature.target_y = original_x, original_y
+        creature.rect.center = (x, y)
+
+    count, = reader.unpack(COUNT)
+    motion = reader.array('f', count * 3)
+    looks = reader.array('B', count * 3)
+    for i, bubble in enumerate(game.bubbles[:count]):
+        bubble.x, bubble.y, bubble.speed = motion[i * 3:i * 3 + 3]
+        bubble.size = looks[i * 3]
+        bubble.color = BUBBLE_COLORS[looks[i * 3 + 1]]
+        bubble.popped = bool(looks[i * 3 + 2])
+
+    count, = reader.unpack(COUNT)
+    currents = reader.array('f', count * 4)
+    for i, current in enumerate(game.ocean_currents[:count]):
+        current['x'], current['y'], current['strength'] = currents[i * 4:i * 4 + 3]
+        current['radius'] = int(currents[i * 4 + 3])
+
+    # A save taken after the final discovery has nothing left to explore
+    if all(creature.visited for creature in game.creatures):
+        game.start_scene(GAME_OVER)
+        return
+
+    # Resume an interrupted quiz on the question that was showing
+    game.state = EXPLORE
+    game.current_creature = None
+    # The scene preloaded at startup followed no discoveries
+    game.scenes.preload(game.upcoming_scene())
+    if current_index < len(game.creatures) and state in (QUIZ, REWARD):
+        creature = game.creatures[current_index]
+        if not creature.visited and creature.current_question_index > 0:
+            game.current_creature = creature
+            game.state = state
+            if state == QUIZ:
+                game.show_question(creature.questions[creature.current_question_index - 1])
+
+def write_atomic(path, data):
+    """Write to a temporary file and rename it over `path`"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load(game, path):
+    with open(path, 'rb') as f:
+        restore(game, f.read())
+
+class Autosaver:
+    """Writes snapshots to disk on a background thread.
+
+    The game thread only calls capture() and hands the bytes over; if a write
+    is still in progress the newest snapshot replaces any pending one.
+    """
+    def __init__(self, path, interval=5000):
+        self.path = path
+        self.interval = interval
+        self.last_save = get_ticks()
+        self.pending = None
+        self.saves = 0
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._writer, name='autosave', daemon=True)
+        self.thread.start()
+
+    def update(self, game, force=False):
+        """Snapshot `game` if the interval has passed or `force` is set"""
+        now = get_ticks()
+        if force or now - self.last_save >= self.interval:
+            self.last_save = now
+            self.submit(capture(game))
+
+    def submit(self, data):
+        with self.condition:
+            self.pending = data
+            self.condition.notify()
+
+    def _writer(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                data, self.pending = self.pending, None
+                if data is None:
+                    return
+            try:
+                write_atomic(self.path, data)
+                self.saves += 1
+            except OSError as e:
+                debug_print(f"Error writing autosave {self.path}: {e}", True)
+
+    def close(self):
+        """Flush any pending snapshot and stop the writer thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
@@ -1,15 +1,21 @@
-import pygame
 import random
 import math
 from ..utils.constants import BUBBLE_COLORS, SCREEN_WIDTH, SCREEN_HEIGHT
+from ..utils.timing import get_ticks
+from ..utils.sprites import primitives
 
 class Bubble:
-    def __init__(self):
-        self.x = random.randint(50, SCREEN_WIDTH - 50)
-        self.y = SCREEN_HEIGHT + random.randint(0, 100)
-        self.speed = random.uniform(1, 3)
-        self.size = random.randint(20, 40)
-        self.color = random.choice(BUBBLE_COLORS)
+    __slots__ = ('x', 'y', 'speed', 'size', 'color', 'sparkle', 'popped')
+
+    def __init__(self, rng=random):
+        self.reset(rng)
+
+    def reset(self, rng=random):
+        self.x = rng.randint(50, SCREEN_WIDTH - 50)
+        self.y = SCREEN_HEIGHT + rng.randint(0, 100)
+        self.speed = rng.uniform(1, 3)
+        self.size = rng.randint(20, 40)
+        self.color = rng.choice(BUBBLE_COLORS)
         self.sparkle = 0
         self.popped = False
         
@@ -26,12 +32,17 @@ class Bubble:
     def update(self):
         if not self.popped:
             self.y -= self.speed
-            self.x += math.sin(pygame.time.get_ticks() * 0.001 + self.y * 0.1) * 0.5
+            self.x += math.sin(get_ticks() * 0.001 + self.y * 0.1) * 0.5
             self.sparkle = (self.sparkle + 1) % 360
             
-    def draw(self, screen):
+    def draw(self, screen, body=None):
+        """Draw with `body` as the bubble sprite, or the shared one for its size and colour"""
         if not self.popped:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
-            shine_pos = (int(self.x + math.cos(self.sparkle * 0.1) * self.size * 0.3),
-                        int(self.y + math.sin(self.sparkle * 0.1) * self.size * 0.3))
-            pygame.draw.circle(screen, (255, 255, 255), shine_pos, self.size // 4)
\ No newline at end of file
+            if body is None:
+                body = primitives.bubble(self.size, self.color)
+            offset = body.get_width() // 2
+            screen.blit(body, (int(self.x) - offset, int(self.y) - offset))
+            shine = primitives.circle(self.size // 4, (255, 255, 255))
+            offset = shine.get_width() // 2
+            screen.blit(shine, (int(self.x + math.cos(self.sparkle * 0.1) * self.size * 0.3) - offset,
+                                int(self.y + math.sin(self.sparkle * 0.1) * self.size * 0.3) - offset))
\ No newline at end of file
@@ -1,8 +1,12 @@
 import pygame
 import math
 from ..utils.constants import BLACK, WHITE
+from ..utils.timing import get_ticks
+from ..utils.sprites import primitives
 
 class Clue:
+    __slots__ = ('x', 'y', 'text', 'creature_hint', 'collected', 'rect', 'is_hovered')
+
     def __init__(self, x, y, text, creature_hint):
         self.x = x
         self.y = y
@@ -20,17 +24,18 @@ class Clue:
         if not self.collected:
             # Draw glowing effect when hovered
             if self.is_hovered:
-                glow_radius = 20 + math.sin(pygame.time.get_ticks() * 0.005) * 3
-                pygame.draw.circle(screen, (255, 255, 150), (self.x, self.y), int(glow_radius))
+                glow_radius = 20 + math.sin(get_ticks() * 0.005) * 3
+                glow = primitives.circle(int(glow_radius), (255, 255, 150))
+                screen.blit(glow, (self.x - glow.get_width()//2, self.y - glow.get_height()//2))
             
-            pygame.draw.circle(screen, (255, 215, 0), (self.x, self.y), 15)
-            pygame.draw.circle(screen, BLACK, (self.x, self.y), 15, 2)
-            text = font.render("?", True, BLACK)
+            screen.blit(primitives.circle(15, (255, 215, 0)), (self.x - 16, self.y - 16))
+            screen.blit(primitives.circle(15, BLACK, 2), (self.x - 16, self.y - 16))
+            text = primitives.text(font, "?", BLACK)
             screen.blit(text, (self.x - text.get_width()//2, self.y - text.get_height()//2))
             
             # Show hint text when hovered
             if self.is_hovered:
-                hint_text = font.render(self.text, True, WHITE)
+                hint_text = primitives.text(font, self.text, WHITE)
                 hint_rect = hint_text.get_rect(center=(self.x, self.y - 30))
                 pygame.draw.rect(screen, (0, 0, 0, 128), hint_rect.inflate(20, 10))
                 screen.blit(hint_text, hint_rect)
\ No newline at end of file
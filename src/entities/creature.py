@@ -1,9 +1,21 @@
-import pygame
 import random
 import math
 from ..utils.constants import WHITE
+from ..utils.timing import get_ticks
+from ..utils.sprites import transforms
+from ..utils.collision import collide_point_transformed
+
+MAX_TILT = 30  # degrees
 
 class Creature:
+    __slots__ = (
+        'x', 'y', 'image', 'name', 'questions', 'current_question_index', 'rect',
+        'visited', 'discovered', 'is_hovered', 'interaction_radius', 'can_interact',
+        'original_x', 'original_y', 'swim_pattern', 'movement_speed', 'movement_radius',
+        'movement_time', 'next_direction_change', 'current_direction', 'target_x',
+        'target_y', 'flip_image', 'dx', 'dy', 'smoothing'
+    )
+
     def __init__(self, x, y, image, name, questions_data):
         self.x = x
         self.y = y
@@ -46,7 +58,7 @@ class Creature:
 
     def update(self, player_pos, mouse_pos):
         if not self.visited:
-            current_time = pygame.time.get_ticks() * 0.001
+            current_time = get_ticks() * 0.001
             self.movement_time += self.movement_speed * 0.02
 
             old_x, old_y = self.x, self.y
@@ -103,14 +115,27 @@ class Creature:
             )
             self.can_interact = player_distance < self.interaction_radius
             
-            if self.can_interact:
-                mouse_distance = math.sqrt(
-                    (mouse_pos[0] - self.x)**2 + 
-                    (mouse_pos[1] - self.y)**2
-                )
-                self.is_hovered = mouse_distance < 50
-            else:
-                self.is_hovered = False
+            self.is_hovered = self.can_interact and self.contains(mouse_pos)
+
+    def pose(self):
+        """Angle and scale the sprite is drawn at"""
+        # Tilt toward the direction of travel; the sprite faces right, so a
+        # mirrored one tilts the other way
+        angle = 0
+        if abs(self.dx) + abs(self.dy) > 0.05:
+            angle = max(-MAX_TILT, min(MAX_TILT, math.degrees(math.atan2(-self.dy, abs(self.dx)))))
+            if self.flip_image:
+                angle = -angle
+        scale = 1.0
+        if self.is_hovered:
+            scale = 1.06 + math.sin(get_ticks() * 0.008) * 0.06
+        return angle, scale
+
+    def contains(self, point):
+        """Whether `point` is on the creature as it is drawn, tilt and
+        hover scale included, rather than the transparent space around it"""
+        angle, scale = self.pose()
+        return collide_point_transformed(self.image, (self.x, self.y), point, angle, scale, self.flip_image)
 
     def draw(self, screen, font):
         # Don't draw if visited
@@ -118,11 +143,9 @@ class Creature:
             return
 
         self.rect.center = (self.x, self.y)
-        if self.flip_image:
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            screen.blit(flipped_image, self.rect)
-        else:
-            screen.blit(self.image, self.rect)
+        angle, scale = self.pose()
+        image = transforms.get(self.image, angle, scale, self.flip_image)
+        screen.blit(image, (self.x - image.get_width() // 2, self.y - image.get_height() // 2))
         
         if self.can_interact and self.is_hovered and not self.visited:
             text = "Click to interact!"
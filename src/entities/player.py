@@ -1,7 +1,9 @@
-import pygame
 from ..utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ..utils.sprites import primitives
 
 class Player:
+    __slots__ = ('x', 'y', 'image', 'speed', 'rect', 'stars')
+
     def __init__(self, image):
         self.x = 100
         self.y = 300
@@ -24,4 +26,5 @@ class Player:
         self.rect.center = (self.x, self.y)
         screen.blit(self.image, self.rect)
         # Draw collision circle for debugging
-        pygame.draw.circle(screen, (0, 255, 0), (self.x, self.y), 5)
\ No newline at end of file
+        dot = primitives.circle(5, (0, 255, 0))
+        screen.blit(dot, (self.x - 6, self.y - 6))
\ No newline at end of file
@@ -1,11 +1,14 @@
 import pygame
 import random
 from ..utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ..utils.collision import collide_rect
 
 class Seashell:
-    def __init__(self, image):
-        self.x = random.randint(50, SCREEN_WIDTH - 50)
-        self.y = random.randint(SCREEN_HEIGHT - 150, SCREEN_HEIGHT - 50)
+    __slots__ = ('x', 'y', 'image', 'rect', 'collected')
+
+    def __init__(self, image, rng=random):
+        self.x = rng.randint(50, SCREEN_WIDTH - 50)
+        self.y = rng.randint(SCREEN_HEIGHT - 150, SCREEN_HEIGHT - 50)
         self.image = image
         self.rect = self.image.get_rect(center=(self.x, self.y))
         self.collected = False
@@ -14,8 +17,8 @@ class Seashell:
         if not self.collected:
             screen.blit(self.image, self.rect)
     
-    def check_collect(self, player_rect):
-        if not self.collected and self.rect.colliderect(player_rect):
+    def check_collect(self, cursor):
+        if not self.collected and collide_rect(self.image, self.rect, cursor):
             self.collected = True
             return True
         return False
\ No newline at end of file
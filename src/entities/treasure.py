@@ -1,10 +1,13 @@
 import pygame
 import random
 from ..utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ..utils.collision import collide
 
 class Treasure:
-    def __init__(self, image):
-        self.x = random.randint(100, SCREEN_WIDTH - 100)
+    __slots__ = ('x', 'y', 'image', 'rect', 'collected')
+
+    def __init__(self, image, rng=random):
+        self.x = rng.randint(100, SCREEN_WIDTH - 100)
         self.y = SCREEN_HEIGHT - 100
         self.image = image
         self.rect = self.image.get_rect(center=(self.x, self.y))
@@ -14,8 +17,8 @@ class Treasure:
         if not self.collected:
             screen.blit(self.image, self.rect)
     
-    def check_collect(self, player_rect):
-        if not self.collected and self.rect.colliderect(player_rect):
+    def check_collect(self, player):
+        if not self.collected and collide(self.image, self.rect, player.image, player.rect):
             self.collected = True
             return True
         return False
\ No newline at end of file
@@ -0,0 +1,5 @@
+from .transport import UdpTransport, LoopbackNetwork
+from .server import GameServer
+from .client import NetworkClient, ClientGame, connect
+
+__all__ = ['UdpTransport', 'LoopbackNetwork', 'GameServer', 'NetworkClient', 'ClientGame', 'connect']
@@ -0,0 +1,313 @@
+import math
+from collections import deque
+import pygame
+from pygame.locals import MOUSEBUTTONDOWN
+
+from . import protocol
+from .protocol import (
+    dequantize, entity_kind, entity_index, entity_id, KIND_PLAYER, KIND_CREATURE, KIND_BUBBLE,
+    FLAG_FLIP, FLAG_VISITED, FLAG_DISCOVERED, FLAG_POPPED
+)
+from ..core.game import Game
+from ..core.input import KeyState
+from ..core.pipeline import FrameSnapshot
+from ..core.replay import TRACKED_KEYS
+from ..entities.player import Player
+from ..utils.constants import FPS, EXPLORE, QUIZ, REWARD, NET_INTERP_DELAY
+from ..utils.debug import debug_print
+from ..utils.timing import get_ticks
+
+BASELINES = 32
+BUFFERED = 16
+CONFIRM_TIMEOUT = 3000  # ms to wait for the server to replicate a discovery
+
+class NetworkClient:
+    """Client end of a co-op session.
+
+    Acknowledges every snapshot it decodes so the server can delta against
+    it, and keeps a short buffer of snapshots so entities can be drawn
+    `interp_delay` ms in the past, interpolated between the two snapshots
+    either side of that time.
+    """
+    def __init__(self, transport, server_address, interp_delay=NET_INTERP_DELAY):
+        self.transport = transport
+        self.server_address = server_address
+        self.interp_delay = interp_delay
+        self.client_id = None
+        self.seed = None
+        self.baselines = {}
+        self.snapshots = deque(maxlen=BUFFERED)  # (server tick, state), oldest first
+        self.acked = 0
+        self.input_seq = 0
+        self.latest_tick = -1
+        self.latest_received = 0
+        self.stale = 0
+
+    def connect(self, timeout=5000):
+        """Say hello until the server welcomes us; returns False on timeout"""
+        deadline = get_ticks() + timeout
+        next_hello = 0
+        while self.client_id is None and get_ticks() < deadline:
+            if get_ticks() >= next_hello:
+                self.send(protocol.PACKET_TYPE.pack(protocol.HELLO))
+                next_hello = get_ticks() + 250
+            self.poll()
+        return self.client_id is not None
+
+    def send(self, data):
+        self.transport.send(data, self.server_address)
+
+    def poll(self):
+        for data, address in self.transport.receive():
+            if address != self.server_address or not data:
+                continue
+            if data[0] == protocol.WELCOME and self.client_id is None:
+                self.client_id, self.seed = protocol.WELCOME_BODY.unpack_from(data, 1)
+            elif data[0] == protocol.SNAPSHOT:
+                self.receive_snapshot(data)
+
+    def receive_snapshot(self, data):
+        decoded = protocol.decode_snapshot(data, self.baselines)
+        if decoded is None:
+            # Its baseline has aged out; the server falls back to a full
+            # snapshot once it sees our ack stop advancing
+            self.stale += 1
+            return
+        seq, tick, state = decoded
+        self.baselines[seq] = state
+        if len(self.baselines) > BASELINES:
+            del self.baselines[next(iter(self.baselines))]
+        if tick <= self.latest_tick:
+            return  # arrived out of order
+        self.acked = seq
+        self.latest_tick = tick
+        self.latest_received = get_ticks()
+        self.snapshots.append((tick, state))
+
+    def send_input(self, keys, mouse_pos, clicked, busy=False):
+        mask = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        self.input_seq = (self.input_seq + 1) & 0xFFFF
+        x = max(-32768, min(32767, int(mouse_pos[0])))
+        y = max(-32768, min(32767, int(mouse_pos[1])))
+        flags = (protocol.INPUT_CLICKED if clicked else 0) | (protocol.INPUT_BUSY if busy else 0)
+        self.send(protocol.PACKET_TYPE.pack(protocol.INPUT) +
+                  protocol.INPUT_BODY.pack(self.input_seq, self.acked, mask, x, y, flags))
+
+    def send_answer(self, creature_index, question_index, answer_index):
+        self.send(protocol.PACKET_TYPE.pack(protocol.ANSWER) +
+                  protocol.ANSWER_BODY.pack(creature_index, question_index, answer_index))
+
+    def latest(self):
+        return self.snapshots[-1][1] if self.snapshots else {}
+
+    def interpolated(self):
+        """Entity states as {id: (x, y, flags, extra)} at the render time.
+
+        Positions are lerped between the snapshots either side of it; flags
+        and extra come from the older of the two.
+        """
+        if not self.snapshots:
+            return {}
+        ms_per_tick = 1000 / FPS
+        render_tick = self.latest_tick + (get_ticks() - self.latest_received - self.interp_delay) / ms_per_tick
+
+        older = newer = None
+        for tick, state in self.snapshots:
+            if tick <= render_tick:
+                older = (tick, state)
+            else:
+                newer = (tick, state)
+                break
+        if older is None:
+            older = newer
+        if newer is None:
+            newer = older
+
+        (t0, a), (t1, b) = older, newer
+        t = 0 if t1 == t0 else (render_tick - t0) / (t1 - t0)
+        result = {}
+        for eid, (x, y, flags, extra) in a.items():
+            x, y = dequantize(x), dequantize(y)
+            target = b.get(eid)
+            if target is not None:
+                x += (dequantize(target[0]) - x) * t
+                y += (dequantize(target[1]) - y) * t
+            result[eid] = (x, y, flags, extra)
+        return result
+
+    def close(self):
+        self.send(protocol.PACKET_TYPE.pack(protocol.BYE))
+        self.transport.close()
+
+class ClientGame(Game):
+    """A Game whose ocean is driven by a server instead of simulated locally.
+
+    Quizzes still run locally; answers are also sent to the server, which
+    checks them and replicates discoveries to every diver. A discovery only
+    counts here once the server's snapshots show it, and stars always come
+    from the server.
+    """
+    def __init__(self, client, **kwargs):
+        self.client = client
+        self.clicked = False
+        self.pending = {}  # creature index -> ticks its last answer was sent
+        self.remote_players = {}
+        self.in_range = set()
+        super().__init__(seed=client.seed, **kwargs)
+
+    def handle_event(self, event):
+        if event.type == MOUSEBUTTONDOWN:
+            if self.state == EXPLORE:
+                self.clicked = True
+            elif self.state == REWARD and self.current_creature is not None and \
+                    self.creatures.index(self.current_creature) in self.pending:
+                # Stay on the reward screen until the server answers
+                return True
+        return super().handle_event(event)
+
+    def check_answer(self, answer_index):
+        creature = self.current_creature
+        self.client.send_answer(self.creatures.index(creature),
+                                creature.current_question_index - 1, answer_index)
+        super().check_answer(answer_index)
+
+    def discover(self, creature):
+        self.pending[self.creatures.index(creature)] = get_ticks()
+
+    def confirm_discoveries(self):
+        latest = self.client.latest()
+        for index, sent in list(self.pending.items()):
+            creature = self.creatures[index]
+            fields = latest.get(entity_id(KIND_CREATURE, index))
+            if fields is not None and fields[2] & FLAG_DISCOVERED:
+                del self.pending[index]
+                creature.visited = creature.discovered = True
+                self.track('discover', creature.name,
+                           value=get_ticks() - self.first_seen.get(creature.name, self.game_start_time))
+            elif get_ticks() - sent > CONFIRM_TIMEOUT:
+                # The server turned the answer down; the quiz starts over
+                del self.pending[index]
+                creature.current_question_index = 0
+                debug_print(f"The server did not confirm discovering the {creature.name}", True)
+
+    def update(self):
+        client = self.client
+        client.poll()
+        # Outside exploring the diver holds still on the server too
+        busy = self.state != EXPLORE
+        client.send_input(KeyState() if busy else self.input.keys, self.input.mouse_pos, self.clicked, busy)
+        self.clicked = False
+        if self.pending:
+            self.confirm_discoveries()
+        own = client.latest().get(entity_id(KIND_PLAYER, client.client_id))
+        if own is not None:
+            self.player.stars = own[3]
+
+        if self.scenes.handles(self.state):
+            self.scenes.update()
+            if self.scenes.current.finished:
+                self.end_scene()
+        elif self.state == EXPLORE:
+            self.apply_state()
+        elif self.state == QUIZ:
+            self.update_buttons()
+        self.update_effects()
+
+    def apply_state(self):
+        client = self.client
+        states = client.interpolated()
+        mouse_pos = self.input.mouse_pos
+
+        # Our own diver is drawn at the newest position we know rather than
+        # the interpolated one, which keeps steering responsive
+        own = client.latest().get(entity_id(KIND_PLAYER, client.client_id))
+        if own is not None:
+            self.player.x, self.player.y = dequantize(own[0]), dequantize(own[1])
+            self.player.rect.center = (self.player.x, self.player.y)
+
+        others = []
+        for eid, (x, y, flags, extra) in states.items():
+            kind = entity_kind(eid)
+            index = entity_index(eid)
+            if kind == KIND_PLAYER:
+                if index == client.client_id:
+                    continue
+                player = self.remote_players.get(index)
+                if player is None:
+                    player = self.remote_players[index] = Player(self.player_img)
+                player.x, player.y = x, y
+                player.stars = extra
+                others.append(player)
+            elif kind == KIND_CREATURE and index < len(self.creatures):
+                creature = self.creatures[index]
+                # Velocity isn't replicated; recover it for the swim tilt
+                creature.dx, creature.dy = x - creature.x, y - creature.y
+                creature.x, creature.y = x, y
+                creature.flip_image = bool(flags & FLAG_FLIP)
+                creature.visited = creature.visited or bool(flags & FLAG_VISITED)
+                creature.discovered = creature.discovered or bool(flags & FLAG_DISCOVERED)
+                distance = math.hypot(self.player.x - x, self.player.y - y)
+                creature.can_interact = distance < creature.interaction_radius
+                creature.is_hovered = creature.can_interact and creature.contains(mouse_pos)
+                if creature.can_interact and creature.name not in self.first_seen:
+                    self.first_seen[creature.name] = get_ticks()
+            elif kind == KIND_BUBBLE and index < len(self.bubbles):
+                bubble = self.bubbles[index]
+                bubble.x, bubble.y = x, y
+                bubble.popped = bool(flags & FLAG_POPPED)
+                bubble.size = extra
+        self.other_players = others
+        self.in_range = set(states)
+
+        # Creatures outside our area of interest can't be reached until they
+        # swim back into range
+        for i, creature in enumerate(self.creatures):
+            if entity_id(KIND_CREATURE, i) not in self.in_range:
+                creature.can_interact = creature.is_hovered = False
+
+        for clue in self.clues:
+            clue.update(mouse_pos)
+
+    def draw(self):
+        # Only draw what the server is currently replicating to us
+        in_range = self.in_range
+        self.render(FrameSnapshot(
+            state=self.state,
+            ocean_currents=self.ocean_currents,
+            bubbles=[b for i, b in enumerate(self.bubbles) if entity_id(KIND_BUBBLE, i) in in_range],
+            clues=self.clues,
+            creatures=[c for i, c in enumerate(self.creatures) if entity_id(KIND_CREATURE, i) in in_range],
+            player=self.player,
+            other_players=self.other_players,
+            current_question=self.current_question,
+            answer_buttons=self.answer_buttons,
+            result_message=self.result_message,
+            celebration_effects=self.celebration_effects,
+            scene=self.scene,
+        ))
+        pygame.display.flip()
+        if self.capture:
+            self.capture.grab(self.screen)
+
+    def end_scene(self):
+        # The ocean belongs to the server, so finishing it doesn't start a
+        # new one here
+        if self.scene.name == 'game_over':
+            self.scenes.exit_current()
+            self.state = EXPLORE
+            return
+        super().end_scene()
+
+    def shutdown(self):
+        self.client.close()
+        super().shutdown()
+
+def connect(transport, server_address, timeout=5000):
+    client = NetworkClient(transport, server_address)
+    if not client.connect(timeout):
+        debug_print(f"No answer from server at {server_address}", True)
+        return None
+    return client
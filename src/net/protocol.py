@@ -0,0 +1,145 @@
+"""
+Wire format for co-op sessions (little endian).
+
+Every packet starts with a one-byte type. Entity positions are quantized to
+1/8 px in unsigned 16-bit fields, and snapshots are delta-compressed against
+the last snapshot the client acknowledged: each entity carries a field mask
+and only fields that changed since that baseline are sent.
+"""
+import struct
+
+HELLO = 1
+WELCOME = 2
+INPUT = 3
+ANSWER = 4
+SNAPSHOT = 5
+BYE = 6
+
+PACKET_TYPE = struct.Struct('<B')
+WELCOME_BODY = struct.Struct('<BI')           # client id, layout seed
+INPUT_BODY = struct.Struct('<HHBhhB')          # input seq, acked snapshot seq, key mask, mouse x, mouse y, input flags
+ANSWER_BODY = struct.Struct('<BBB')            # creature index, question index, answer index
+SNAPSHOT_HEADER = struct.Struct('<HHIH')       # seq, baseline seq (0 = none), server tick, entity count
+ENTITY_HEADER = struct.Struct('<HB')           # entity id, field mask
+COORD = struct.Struct('<H')
+BYTE = struct.Struct('<B')
+
+POSITION_SCALE = 8
+POSITION_OFFSET = 256  # lets entities just above/left of the screen round-trip
+
+# Field mask bits
+FIELD_X = 1
+FIELD_Y = 2
+FIELD_FLAGS = 4
+FIELD_EXTRA = 8
+REMOVED = 0x80
+ALL_FIELDS = FIELD_X | FIELD_Y | FIELD_FLAGS | FIELD_EXTRA
+
+# Entity ids: the high byte is the kind, the low byte the index
+KIND_PLAYER = 0
+KIND_CREATURE = 1
+KIND_BUBBLE = 2
+
+# Input flag bits
+INPUT_CLICKED = 1
+INPUT_BUSY = 2  # in a quiz, reward screen or mini-game; the diver holds still
+
+# Flag bits
+FLAG_FLIP = 1
+FLAG_HOVERED = 2
+FLAG_VISITED = 4
+FLAG_DISCOVERED = 8
+FLAG_POPPED = 16
+FLAG_CAN_INTERACT = 32
+
+def entity_id(kind, index):
+    return (kind << 8) | index
+
+def entity_kind(eid):
+    return eid >> 8
+
+def entity_index(eid):
+    return eid & 0xFF
+
+def quantize(value):
+    return max(0, min(0xFFFF, int(round((value + POSITION_OFFSET) * POSITION_SCALE))))
+
+def dequantize(value):
+    return value / POSITION_SCALE - POSITION_OFFSET
+
+def encode_snapshot(seq, baseline_seq, tick, state, baseline):
+    """Encode `state` ({id: (x, y, flags, extra)} of quantized values) as a delta against `baseline`"""
+    parts = []
+    count = 0
+    for eid, fields in state.items():
+        old = baseline.get(eid)
+        if old is None:
+            mask = ALL_FIELDS
+        else:
+            mask = 0
+            if fields[0] != old[0]:
+                mask |= FIELD_X
+            if fields[1] != old[1]:
+                mask |= FIELD_Y
+            if fields[2] != old[2]:
+                mask |= FIELD_FLAGS
+            if fields[3] != old[3]:
+                mask |= FIELD_EXTRA
+            if not mask:
+                continue
+        parts.append(ENTITY_HEADER.pack(eid, mask))
+        if mask & FIELD_X:
+            parts.append(COORD.pack(fields[0]))
+        if mask & FIELD_Y:
+            parts.append(COORD.pack(fields[1]))
+        if mask & FIELD_FLAGS:
+            parts.append(BYTE.pack(fields[2]))
+        if mask & FIELD_EXTRA:
+            parts.append(BYTE.pack(fields[3]))
+        count += 1
+
+    # Entities the client knows about that left its area of interest
+    for eid in baseline:
+        if eid not in state:
+            parts.append(ENTITY_HEADER.pack(eid, REMOVED))
+            count += 1
+
+    return PACKET_TYPE.pack(SNAPSHOT) + SNAPSHOT_HEADER.pack(seq, baseline_seq, tick, count) + b''.join(parts)
+
+def decode_snapshot(data, baselines):
+    """Decode a snapshot packet into (seq, tick, state).
+
+    `baselines` maps snapshot seq to previously decoded states. Returns None
+    if the packet's baseline is no longer known.
+    """
+    offset = PACKET_TYPE.size
+    seq, baseline_seq, tick, count = SNAPSHOT_HEADER.unpack_from(data, offset)
+    offset += SNAPSHOT_HEADER.size
+    if baseline_seq:
+        if baseline_seq not in baselines:
+            return None
+        state = dict(baselines[baseline_seq])
+    else:
+        state = {}
+
+    for _ in range(count):
+        eid, mask = ENTITY_HEADER.unpack_from(data, offset)
+        offset += ENTITY_HEADER.size
+        if mask & REMOVED:
+            state.pop(eid, None)
+            continue
+        x, y, flags, extra = state.get(eid, (0, 0, 0, 0))
+        if mask & FIELD_X:
+            x, = COORD.unpack_from(data, offset)
+            offset += COORD.size
+        if mask & FIELD_Y:
+            y, = COORD.unpack_from(data, offset)
+            offset += COORD.size
+        if mask & FIELD_FLAGS:
+            flags, = BYTE.unpack_from(data, offset)
+            offset += BYTE.size
+        if mask & FIELD_EXTRA:
+            extra, = BYTE.unpack_from(data, offset)
+            offset += BYTE.size
+        state[eid] = (x, y, flags, extra)
+    return seq, tick, state
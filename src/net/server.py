@@ -0,0 +1,206 @@
+import math
+import pygame
+
+from . import protocol
+from .protocol import (
+    entity_id, quantize, KIND_PLAYER, KIND_CREATURE, KIND_BUBBLE,
+    FLAG_FLIP, FLAG_VISITED, FLAG_DISCOVERED, FLAG_POPPED
+)
+from ..core.input import KeyState
+from ..core.replay import TRACKED_KEYS, new_seed
+from ..entities.player import Player
+from ..utils.constants import FPS, NET_SEND_RATE, NET_INTEREST_RADIUS, NET_MAX_CLIENTS
+from ..utils.debug import debug_print
+
+HISTORY = 32
+TIMEOUT_TICKS = FPS * 5
+
+class RemoteClient:
+    def __init__(self, client_id, address, player, tick):
+        self.client_id = client_id
+        self.address = address
+        self.player = player
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+        self.clicked = False
+        self.busy = False
+        self.input_seq = 0
+        self.acked = 0
+        self.history = {}
+        self.last_heard = tick
+
+class GameServer:
+    """Authoritative co-op server.
+
+    Runs the shared ocean headlessly, moves each client's diver from their
+    input, and sends every client delta-compressed snapshots of the entities
+    near its diver at `send_rate` Hz.
+    """
+    def __init__(self, transport, seed=None, send_rate=NET_SEND_RATE,
+                 interest_radius=NET_INTEREST_RADIUS, max_clients=NET_MAX_CLIENTS):
+        from ..core.game import Game
+
+        self.transport = transport
+        self.seed = seed if seed is not None else new_seed()
+        self.game = Game(seed=self.seed, headless=True)
+        self.send_every = max(1, FPS // send_rate)
+        self.interest_radius = interest_radius
+        self.max_clients = max_clients
+        self.clients = {}
+        self.tick_count = 0
+        self.snapshot_seq = 0
+
+    def handle_packets(self):
+        for data, address in self.transport.receive():
+            if not data:
+                continue
+            kind = data[0]
+            client = self.clients.get(address)
+            if kind == protocol.HELLO:
+                client = client or self.add_client(address)
+                if client:
+                    self.transport.send(protocol.PACKET_TYPE.pack(protocol.WELCOME) +
+                                        protocol.WELCOME_BODY.pack(client.client_id, self.seed), address)
+            elif client is None:
+                continue
+            elif kind == protocol.INPUT and len(data) >= 1 + protocol.INPUT_BODY.size:
+                seq, acked, mask, x, y, flags = protocol.INPUT_BODY.unpack_from(data, 1)
+                client.last_heard = self.tick_count
+                # Inputs can arrive out of order; keep only the newest
+                if (seq - client.input_seq) & 0xFFFF < 0x8000:
+                    client.input_seq = seq
+                    client.acked = acked
+                    client.keys = KeyState(key for bit, key in enumerate(TRACKED_KEYS) if mask & (1 << bit))
+                    client.mouse_pos = (x, y)
+                    client.clicked = client.clicked or bool(flags & protocol.INPUT_CLICKED)
+                    client.busy = bool(flags & protocol.INPUT_BUSY)
+            elif kind == protocol.ANSWER and len(data) >= 1 + protocol.ANSWER_BODY.size:
+                self.handle_answer(client, *protocol.ANSWER_BODY.unpack_from(data, 1))
+            elif kind == protocol.BYE:
+                self.remove_client(address)
+
+    def add_client(self, address):
+        if len(self.clients) >= self.max_clients:
+            debug_print(f"Server full, refusing {address}", True)
+            return None
+        used = {c.client_id for c in self.clients.values()}
+        client_id = next(i for i in range(self.max_clients) if i not in used)
+        client = RemoteClient(client_id, address, Player(self.game.player_img), self.tick_count)
+        self.clients[address] = client
+        debug_print(f"Diver {client_id} joined from {address}", True)
+        return client
+
+    def remove_client(self, address):
+        client = self.clients.pop(address, None)
+        if client:
+            debug_print(f"Diver {client.client_id} left", True)
+
+    def handle_answer(self, client, creature_index, question_index, answer_index):
+        creatures = self.game.creatures
+        if creature_index >= len(creatures):
+            return
+        creature = creatures[creature_index]
+        if creature.visited or question_index >= len(creature.questions):
+            return
+        distance = math.hypot(client.player.x - creature.x, client.player.y - creature.y)
+        if distance > creature.interaction_radius * 1.5:
+            return
+        # A diver discovers a creature by answering its last question correctly
+        if question_index == len(creature.questions) - 1 and \
+                answer_index == creature.questions[question_index]["correct"]:
+            creature.visited = True
+            creature.discovered = True
+            client.player.stars += 1
+
+    def simulate(self):
+        game = self.game
+        clients = list(self.clients.values())
+        for client in clients:
+            # A diver in a quiz or mini-game stays put, currents included, so
+            # they are still in range when their answer arrives
+            if client.busy:
+                continue
+            game.move_player(client.player, client.keys)
+            if client.clicked:
+                client.clicked = False
+                for bubble in game.bubbles:
+                    if bubble.check_pop(client.mouse_pos):
+                        game.bubble_count += 1
+
+        # Creatures react to whichever diver is closest
+        for creature in game.creatures:
+            nearest = None
+            best = None
+            for client in clients:
+                d = (client.player.x - creature.x) ** 2 + (client.player.y - creature.y) ** 2
+                if best is None or d < best:
+                    nearest, best = client, d
+            if nearest is None:
+                creature.update((-10000, -10000), (-10000, -10000))
+            else:
+                creature.update((nearest.player.x, nearest.player.y), nearest.mouse_pos)
+        game.update_bubbles()
+
+    def world_state(self):
+        """Every replicated entity as (x, y, quantized fields)"""
+        entities = []
+        for client in self.clients.values():
+            p = client.player
+            entities.append((p.x, p.y, entity_id(KIND_PLAYER, client.client_id),
+                             (quantize(p.x), quantize(p.y), 0, min(p.stars, 255))))
+        for i, c in enumerate(self.game.creatures):
+            flags = (FLAG_FLIP if c.flip_image else 0) | \
+                (FLAG_VISITED if c.visited else 0) | (FLAG_DISCOVERED if c.discovered else 0)
+            entities.append((c.x, c.y, entity_id(KIND_CREATURE, i),
+                             (quantize(c.x), quantize(c.y), flags, 0)))
+        for i, b in enumerate(self.game.bubbles):
+            entities.append((b.x, b.y, entity_id(KIND_BUBBLE, i),
+                             (quantize(b.x), quantize(b.y), FLAG_POPPED if b.popped else 0, b.size)))
+        return entities
+
+    def send_snapshots(self):
+        entities = self.world_state()
+        radius_sq = self.interest_radius ** 2
+        self.snapshot_seq = self.snapshot_seq % 0xFFFF + 1
+        seq = self.snapshot_seq
+        tick = self.tick_count
+        own_kind = KIND_PLAYER << 8
+
+        for client in self.clients.values():
+            px, py = client.player.x, client.player.y
+            own = own_kind | client.client_id
+            state = {
+                eid: fields for x, y, eid, fields in entities
+                if eid == own or (x - px) ** 2 + (y - py) ** 2 <= radius_sq
+            }
+            baseline = client.history.get(client.acked)
+            baseline_seq = client.acked if baseline is not None else 0
+            packet = protocol.encode_snapshot(seq, baseline_seq, tick, state, baseline or {})
+            self.transport.send(packet, client.address)
+
+            client.history[seq] = state
+            if len(client.history) > HISTORY:
+                del client.history[next(iter(client.history))]
+
+    def tick(self):
+        self.handle_packets()
+        self.simulate()
+        self.tick_count += 1
+        if self.tick_count % self.send_every == 0:
+            self.send_snapshots()
+
+        for address, client in list(self.clients.items()):
+            if self.tick_count - client.last_heard > TIMEOUT_TICKS:
+                self.remove_client(address)
+
+    def run(self):
+        clock = pygame.time.Clock()
+        debug_print(f"Ocean Explorer server listening on {self.transport.address} (seed {self.seed})", True)
+        try:
+            while True:
+                clock.tick(FPS)
+                self.tick()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.transport.close()
@@ -0,0 +1,63 @@
+import socket
+from collections import deque
+
+MAX_PACKET = 1400
+
+class UdpTransport:
+    """Non-blocking UDP socket; receive() returns every datagram waiting"""
+    def __init__(self, bind=('0.0.0.0', 0)):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(bind)
+        self.address = self.sock.getsockname()
+        self.bytes_sent = 0
+
+    def send(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+            self.bytes_sent += len(data)
+        except (BlockingIOError, ConnectionError):
+            # Unreliable by design; the next snapshot supersedes this one
+            pass
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_PACKET)
+            except (BlockingIOError, ConnectionError):
+                return packets
+            packets.append((data, address))
+
+    def close(self):
+        self.sock.close()
+
+class LoopbackNetwork:
+    """In-process stand-in for the network, for tests and local play"""
+    def __init__(self):
+        self.queues = {}
+
+    def endpoint(self, address):
+        self.queues[address] = deque()
+        return LoopbackTransport(self, address)
+
+class LoopbackTransport:
+    def __init__(self, network, address):
+        self.network = network
+        self.address = address
+        self.bytes_sent = 0
+
+    def send(self, data, address):
+        queue = self.network.queues.get(address)
+        if queue is not None:
+            queue.append((bytes(data), self.address))
+            self.bytes_sent += len(data)
+
+    def receive(self):
+        queue = self.network.queues[self.address]
+        packets = list(queue)
+        queue.clear()
+        return packets
+
+    def close(self):
+        self.network.queues.pop(self.address, None)
@@ -0,0 +1,16 @@
+from .base import Scene, MiniGame
+from .manager import SceneManager
+from .bubble_game import BubbleGame
+from .treasure_game import TreasureGame
+from .seashell_game import SeashellGame
+from .game_over import GameOver
+
+__all__ = [
+    'Scene',
+    'MiniGame',
+    'SceneManager',
+    'BubbleGame',
+    'TreasureGame',
+    'SeashellGame',
+    'GameOver'
+]
@@ -0,0 +1,152 @@
+import copy
+import random
+import pygame
+
+from ..utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, YELLOW
+from ..utils.snapshot import detach
+from ..utils.sprites import primitives
+from ..utils.timing import get_ticks
+
+class Scene:
+    """A self-contained mode of play run by the SceneManager.
+
+    load() runs on the loader thread before the scene is needed. It may
+    read the game's assets and build and convert surfaces the scene owns,
+    but must not change the game or the shared sprite caches, render text
+    or use the shared random module; entities are built from `self.rng`,
+    which is seeded on the game thread so replays stay deterministic.
+    Everything else runs on the game thread. exit() releases what load()
+    built, so a scene only holds memory while it is queued or active.
+    """
+    name = ''
+    entity_lists = ()  # attributes holding entity lists, copied by snapshot()
+
+    def __init__(self, game, seed):
+        self.game = game
+        self.rng = random.Random(seed)
+        self.finished = False
+        self.started = 0
+
+    def load(self):
+        pass
+
+    def enter(self):
+        self.started = get_ticks()
+
+    def exit(self):
+        self.release()
+
+    def release(self):
+        for name in self.entity_lists:
+            setattr(self, name, [])
+
+    def update(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def draw(self, screen):
+        pass
+
+    def snapshot(self):
+        """Copy of the scene that the render thread can draw while the
+        simulation thread keeps updating this one"""
+        clone = copy.copy(self)
+        for name in self.entity_lists:
+            setattr(clone, name, [detach(e) for e in getattr(self, name)])
+        return clone
+
+class MiniGame(Scene):
+    """A timed round with a score, then a results panel.
+
+    Subclasses implement play(), handle_play_event() and draw_play().
+    """
+    title = ''
+    instructions = ''
+    score_label = ''
+    duration = 20000
+    results_time = 4000
+
+    def __init__(self, game, seed):
+        super().__init__(game, seed)
+        self.score = 0
+        self.ended = None
+
+    def enter(self):
+        super().enter()
+        self.score = 0
+        self.ended = None
+
+    @property
+    def remaining(self):
+        """Time left in the round, frozen once the round has ended"""
+        now = get_ticks() if self.ended is None else self.ended
+        return max(0, self.duration - (now - self.started))
+
+    def end_round(self):
+        if self.ended is None:
+            self.ended = get_ticks()
+
+    def update(self):
+        if self.ended is None:
+            self.play()
+            if self.remaining == 0:
+                self.end_round()
+        elif get_ticks() - self.ended >= self.results_time:
+            self.finished = True
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        if self.ended is None:
+            self.handle_play_event(event)
+        else:
+            self.finished = True
+
+    def play(self):
+        pass
+
+    def handle_play_event(self, event):
+        pass
+
+    def draw_play(self, screen):
+        pass
+
+    def celebrate(self, x, y):
+        game = self.game
+        game.celebration_effects.append(game.effect_pool.acquire(x, y))
+
+    def draw(self, screen):
+        game = self.game
+        self.draw_play(screen)
+
+        # Title, instructions, score and a bar for the time left
+        title = primitives.text(game.large_font, self.title, WHITE)
+        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 30))
+        hint = primitives.text(game.font, self.instructions, WHITE)
+        screen.blit(hint, (SCREEN_WIDTH // 2 - hint.get_width() // 2, 75))
+        score = game.large_font.render(f"{self.score_label}: {self.score}", True, YELLOW)
+        screen.blit(score, (40, 30))
+        bar = pygame.Rect(SCREEN_WIDTH // 2 - 200, 115, 400, 12)
+        pygame.draw.rect(screen, BLACK, bar.inflate(4, 4), border_radius=6)
+        bar.width = int(bar.width * self.remaining / self.duration)
+        pygame.draw.rect(screen, YELLOW, bar, border_radius=6)
+
+        if self.ended is not None:
+            self.draw_results(screen)
+
+    def draw_results(self, screen):
+        game = self.game
+        box = pygame.Rect(SCREEN_WIDTH // 2 - 250, SCREEN_HEIGHT // 2 - 100, 500, 200)
+        screen.blit(primitives.rounded_rect(box.width, box.height, WHITE, 15), box)
+        lines = (
+            (game.large_font, "Time's up!" if self.remaining == 0 else "You found them all!", BLACK),
+            (game.large_font, f"{self.score_label}: {self.score}", BLACK),
+            (game.font, "Click to keep exploring", (0, 100, 200)),
+        )
+        y = box.top + 30
+        for font, text, color in lines:
+            surface = primitives.text(font, text, color)
+            screen.blit(surface, (SCREEN_WIDTH // 2 - surface.get_width() // 2, y))
+            y += 55
@@ -0,0 +1,51 @@
+from ..entities.bubble import Bubble
+from ..utils.constants import SCREEN_HEIGHT, BUBBLE_COLORS
+from ..utils.sprites import primitives
+from .base import MiniGame
+
+class BubbleGame(MiniGame):
+    name = 'bubble_game'
+    title = "Bubble Burst!"
+    instructions = "Pop as many bubbles as you can"
+    score_label = "Bubbles"
+    entity_lists = ('bubbles',)
+    bubble_count = 40
+
+    def load(self):
+        rng = self.rng
+        self.bubbles = []
+        for _ in range(self.bubble_count):
+            bubble = Bubble(rng)
+            bubble.y = rng.randint(SCREEN_HEIGHT // 3, SCREEN_HEIGHT * 2)
+            bubble.speed = rng.uniform(2, 5)
+            self.bubbles.append(bubble)
+        # Every bubble sprite is drawn here rather than on the first frames.
+        # They belong to the scene, so the shared primitive cache is untouched.
+        self.sprites = {
+            (size, color): primitives.draw_bubble(size, color)
+            for size in range(20, 41) for color in BUBBLE_COLORS
+        }
+
+    def release(self):
+        super().release()
+        self.sprites = None
+
+    def play(self):
+        rng = self.rng
+        for bubble in self.bubbles:
+            bubble.update()
+            if bubble.y < -50 or bubble.popped:
+                bubble.reset(rng)
+                bubble.speed = rng.uniform(2, 5)
+
+    def handle_play_event(self, event):
+        for bubble in self.bubbles:
+            if bubble.check_pop(event.pos):
+                self.score += 1
+                self.celebrate(bubble.x, bubble.y)
+                break
+
+    def draw_play(self, screen):
+        sprites = self.sprites
+        for bubble in self.bubbles:
+            bubble.draw(screen, sprites[bubble.size, bubble.color])
@@ -0,0 +1,62 @@
+import math
+import pygame
+
+from ..utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, YELLOW
+from .base import Scene
+
+def draw_star(size, color):
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = size / 2
+    points = []
+    for i in range(10):
+        radius = center - 1 if i % 2 == 0 else center * 0.45
+        angle = -math.pi / 2 + i * math.pi / 5
+        points.append((center + math.cos(angle) * radius, center + math.sin(angle) * radius))
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, BLACK, points, 2)
+    return surface
+
+class GameOver(Scene):
+    """Summary shown once every creature has been discovered"""
+    name = 'game_over'
+
+    def load(self):
+        self.panel = pygame.Surface((800, 560), pygame.SRCALPHA)
+        pygame.draw.rect(self.panel, (0, 0, 0, 120), self.panel.get_rect().move(8, 8), border_radius=25)
+        pygame.draw.rect(self.panel, WHITE, self.panel.get_rect().inflate(-8, -8), border_radius=25)
+        self.star = draw_star(48, YELLOW)
+
+    def enter(self):
+        super().enter()
+        game = self.game
+        # Text is rendered here rather than in load(); fonts aren't thread safe
+        lines = [
+            (game.large_font, "You discovered every creature!", BLACK),
+            (game.font, f"Stars earned: {game.player.stars}", BLACK),
+            (game.font, f"Bubbles popped: {game.bubble_count}", BLACK),
+        ]
+        for name, score in game.minigame_scores.items():
+            lines.append((game.font, f"Best {name}: {score}", BLACK))
+        lines.append((game.font, "Click to explore a new ocean", (0, 100, 200)))
+        self.lines = [font.render(text, True, color) for font, text, color in lines]
+
+    def release(self):
+        self.panel = None
+        self.star = None
+        self.lines = []
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.finished = True
+
+    def draw(self, screen):
+        panel_rect = self.panel.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        screen.blit(self.panel, panel_rect)
+        stars = min(self.game.player.stars, 12)
+        x = SCREEN_WIDTH // 2 - stars * 28
+        for i in range(stars):
+            screen.blit(self.star, (x + i * 56, panel_rect.top + 40))
+        y = panel_rect.top + 120
+        for line in self.lines:
+            screen.blit(line, (SCREEN_WIDTH // 2 - line.get_width() // 2, y))
+            y += 60
@@ -0,0 +1,88 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.debug import debug_print
+
+def _release_loaded(future):
+    if future.exception() is None:
+        future.result().release()
+
+class SceneManager:
+    """Runs the scene for the current game state and preloads the next one.
+
+    preload() builds a scene and loads it on a single worker thread while
+    the current scene keeps playing, so switch() usually finds it ready.
+    Only the active scene and at most one preloaded scene are kept.
+    """
+    def __init__(self, game, scene_types):
+        self.game = game
+        self.scene_types = scene_types
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scene-loader')
+        self.pending = {}   # state -> Future of a loaded scene
+        self.current = None
+        self.current_state = None
+        self.waits = []     # ms switch() spent waiting on a load
+
+    def handles(self, state):
+        return state in self.scene_types
+
+    def preload(self, state):
+        if state in self.pending:
+            return
+        for other in list(self.pending):
+            self.discard(other)
+        # Seeded here, on the game thread, so the scene's layout is the same
+        # however long the load takes
+        scene = self.scene_types[state](self.game, random.getrandbits(32))
+        self.pending[state] = self.executor.submit(self._load, scene)
+
+    @staticmethod
+    def _load(scene):
+        scene.load()
+        return scene
+
+    def discard(self, state):
+        future = self.pending.pop(state, None)
+        if future is not None and not future.cancel():
+            future.add_done_callback(_release_loaded)
+
+    def switch(self, state):
+        """Leave the current scene and enter the one for `state`"""
+        self.exit_current()
+        self.preload(state)
+        future = self.pending.pop(state)
+        start = time.perf_counter()
+        scene = future.result()
+        waited = (time.perf_counter() - start) * 1000
+        self.waits.append(waited)
+        if waited > 1:
+            debug_print(f"Waited {waited:.1f}ms for the {scene.name} scene to load")
+        self.current = scene
+        self.current_state = state
+        scene.enter()
+        return scene
+
+    def exit_current(self):
+        if self.current is not None:
+            self.current.exit()
+            self.current = None
+            self.current_state = None
+
+    def reset(self):
+        self.exit_current()
+        for state in list(self.pending):
+            self.discard(state)
+
+    def update(self):
+        self.current.update()
+
+    def handle_event(self, event):
+        self.current.handle_event(event)
+
+    def snapshot(self):
+        return self.current.snapshot() if self.current is not None else None
+
+    def close(self):
+        self.reset()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,56 @@
+import os
+import math
+import pygame
+
+from ..entities.seashell import Seashell
+from ..utils.loader import load_image
+from .base import MiniGame
+
+SHELL_COLORS = [(250, 200, 180), (255, 235, 205), (230, 170, 200)]
+
+def draw_shell(color, size=60):
+    """A scallop shell: a fan of ridges over a small hinge"""
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    hinge = (size // 2, size - 8)
+    radius = size // 2 - 2
+    outline = tuple(max(0, c - 70) for c in color)
+    points = [hinge]
+    for i in range(11):
+        angle = math.pi * (1.1 + 0.8 * i / 10)
+        points.append((hinge[0] + math.cos(angle) * radius * 1.1, hinge[1] + math.sin(angle) * radius * 1.4))
+    pygame.draw.polygon(surface, color, points)
+    for point in points[1:]:
+        pygame.draw.line(surface, outline, hinge, point, 2)
+    pygame.draw.polygon(surface, outline, points, 2)
+    pygame.draw.rect(surface, color, (hinge[0] - 8, hinge[1] - 2, 16, 8), border_radius=3)
+    return surface
+
+class SeashellGame(MiniGame):
+    name = 'seashell_game'
+    title = "Seashell Hunt!"
+    instructions = "Click the shells hiding in the sand"
+    score_label = "Shells"
+    entity_lists = ('shells',)
+    shell_count = 12
+
+    def load(self):
+        if os.path.isfile(os.path.join('assets', 'images', 'seashell.png')):
+            images = [pygame.transform.smoothscale(load_image('seashell.png'), (60, 60))]
+        else:
+            images = [draw_shell(color) for color in SHELL_COLORS]
+        self.shells = [Seashell(images[i % len(images)], self.rng) for i in range(self.shell_count)]
+
+    def handle_play_event(self, event):
+        cursor = pygame.Rect(event.pos[0] - 10, event.pos[1] - 10, 20, 20)
+        for i in cursor.collidelistall(self.shells):
+            shell = self.shells[i]
+            if shell.check_collect(cursor):
+                self.score += 1
+                self.celebrate(shell.x, shell.y)
+                break
+        if self.score == len(self.shells):
+            self.end_round()
+
+    def draw_play(self, screen):
+        for shell in self.shells:
+            shell.draw(screen)
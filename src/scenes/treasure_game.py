@@ -0,0 +1,52 @@
+import pygame
+
+from ..entities.player import Player
+from ..entities.treasure import Treasure
+from ..utils.constants import SCREEN_WIDTH
+from ..utils.loader import load_image
+from ..utils.snapshot import detach
+from .base import MiniGame
+
+class TreasureGame(MiniGame):
+    name = 'treasure_game'
+    title = "Treasure Dive!"
+    instructions = "Swim down and grab the treasure chests"
+    score_label = "Treasure"
+    entity_lists = ('treasures',)
+    duration = 25000
+    treasure_count = 6
+
+    def load(self):
+        # The image belongs to the scene; a stand-in for a missing file is
+        # coloured from the scene's own random stream
+        image = load_image('treasure.png', rng=self.rng)
+        self.image = pygame.transform.smoothscale(image, (90, 90))
+        self.treasures = [Treasure(self.image, self.rng) for _ in range(self.treasure_count)]
+        self.diver = Player(self.game.player_img)
+        self.diver.move(SCREEN_WIDTH // 2 - self.diver.x, 200 - self.diver.y)
+
+    def release(self):
+        super().release()
+        self.image = None
+
+    def play(self):
+        game = self.game
+        game.move_player(self.diver, game.input.keys)
+        # Only treasures the diver's rect touches need a pixel test
+        for i in self.diver.rect.collidelistall(self.treasures):
+            treasure = self.treasures[i]
+            if treasure.check_collect(self.diver):
+                self.score += 1
+                self.celebrate(treasure.x, treasure.y)
+        if self.score == len(self.treasures):
+            self.end_round()
+
+    def draw_play(self, screen):
+        for treasure in self.treasures:
+            treasure.draw(screen)
+        self.diver.draw(screen)
+
+    def snapshot(self):
+        clone = super().snapshot()
+        clone.diver = detach(self.diver)
+        return clone
@@ -1,9 +1,11 @@
 from .button import Button
 from .animated_button import AnimatedButton
 from .effects import CelebrationEffect
+from .caustics import CausticsLayer
 
 __all__ = [
     'Button',
     'AnimatedButton',
-    'CelebrationEffect'
+    'CelebrationEffect',
+    'CausticsLayer'
 ]
\ No newline at end of file
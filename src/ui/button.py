@@ -2,8 +2,14 @@ import pygame
 from ..utils.constants import BLACK
 
 class Button:
+    __slots__ = ('rect', 'text', 'color', 'hover_color', 'is_hovered')
+
     def __init__(self, x, y, width, height, text, color):
         self.rect = pygame.Rect(x, y, width, height)
+        self.reset(x, y, width, height, text, color)
+
+    def reset(self, x, y, width, height, text, color):
+        self.rect.update(x, y, width, height)
         self.text = text
         self.color = color
         self.hover_color = (min(color[0] + 30, 255), min(color[1] + 30, 255), min(color[2] + 30, 255))
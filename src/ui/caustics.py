@@ -0,0 +1,126 @@
+"""
+Animated caustics and light shafts over the ocean background.
+
+A short seamless loop of frames is generated once with NumPy on a
+background thread and kept as half-resolution 8-bit surfaces, about half a
+megabyte each at 1920x1080. Only when the loop advances is the current
+frame expanded, through surfaces allocated once, and added onto a copy of
+the background, so the game still draws its background with a single blit.
+"""
+import math
+import threading
+import pygame
+
+from ..utils.debug import debug_print
+from ..utils.timing import get_ticks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOOP_FRAMES = 32
+LOOP_FPS = 15
+RESOLUTION = 2   # frames are stored at 1/RESOLUTION of the screen size
+INTENSITY = 90   # brightest added light, out of 255
+
+# (x frequency, y frequency, loop multiple) of the interfering ripples; the
+# loop multiples are whole numbers so the last frame leads into the first
+WAVES = ((9, 4, 1), (-6, 8, 2), (4, -10, -1), (12, 2, -2), (-11, -5, 1))
+
+# Cyan-tinted light; the palette index is the brightness
+PALETTE = [(int(i * 0.7), int(i * 0.95), i) for i in range(256)]
+
+def generate_frames(width, height, count=LOOP_FRAMES):
+    """Brightness of each loop frame as (width, height) uint8 arrays"""
+    x, y = np.meshgrid(
+        np.linspace(0, 1, width, dtype=np.float32),
+        np.linspace(0, 1, height, dtype=np.float32),
+        indexing='ij'
+    )
+    depth = 1 - y
+    frames = []
+    for i in range(count):
+        phase = 2 * math.pi * i / count
+        ripples = np.zeros_like(x)
+        for a, b, w in WAVES:
+            ripples += np.sin(a * 2 * math.pi * x + b * 2 * math.pi * y + w * phase +
+                              np.sin(b * math.pi * x - a * math.pi * y + phase) * 1.5)
+        # Light focuses where the ripples cancel out
+        caustics = np.clip(1 - np.abs(ripples) / 1.2, 0, 1) ** 4 * (0.3 + 0.7 * depth)
+        shafts = np.clip(np.sin(x * 40 + y * 8 + phase) * np.sin(x * 17 - phase) + 0.2, 0, 1) * depth ** 2
+        light = np.clip(caustics * 0.8 + shafts * 0.4, 0, 1)
+        frames.append((light * INTENSITY).astype(np.uint8))
+    return frames
+
+class CausticsLayer:
+    def __init__(self, width, height, frames=LOOP_FRAMES, fps=LOOP_FPS):
+        self.size = (width, height)
+        self.frame_count = frames
+        self.fps = fps
+        self.frames = None
+        self.thread = None
+        self.base = None
+        self.half = None
+        self.light = None
+        self.composed = None
+        self.composed_index = -1
+        self.composed_background = None
+        self.light_index = -1
+
+    def start(self):
+        """Generate the loop on a background thread; until it finishes the
+        plain background is shown"""
+        if np is None:
+            debug_print("NumPy is not installed; skipping the caustics animation", True)
+            return
+        self.thread = threading.Thread(target=self._generate, name='caustics', daemon=True)
+        self.thread.start()
+
+    def _generate(self):
+        width, height = self.size[0] // RESOLUTION, self.size[1] // RESOLUTION
+        frames = []
+        for brightness in generate_frames(width, height, self.frame_count):
+            surface = pygame.Surface((width, height), depth=8)
+            surface.set_palette(PALETTE)
+            pygame.surfarray.blit_array(surface, brightness)
+            frames.append(surface)
+        self.frames = frames
+
+    def compose(self, background):
+        """`background` with the current caustics frame added on top"""
+        frames = self.frames
+        if frames is None:
+            return background
+        index = get_ticks() * self.fps // 1000 % len(frames)
+        if background is not self.composed_background:
+            # An opaque copy of the background makes both the per-loop-frame
+            # restore and the per-frame blit plain copies. The frame is
+            # expanded into `half` and `light`, made here once in the same
+            # format, so an advance allocates nothing.
+            self.base = background.convert()
+            self.composed = self.base.copy()
+            self.light = self.base.copy()
+            self.half = pygame.Surface(frames[0].get_size(), 0, self.base)
+            self.composed_background = background
+            self.composed_index = -1
+            self.light_index = -1
+        if index != self.composed_index:
+            if index != self.light_index:
+                self.expand(index)
+            self.composed.blit(self.base, (0, 0))
+            self.composed.blit(self.light, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+            self.composed_index = index
+        else:
+            # Expand the next frame on one of the frames between advances,
+            # so an advance is only the restore and the additive blit
+            upcoming = (index + 1) % len(frames)
+            if upcoming != self.light_index:
+                self.expand(upcoming)
+        return self.composed
+
+    def expand(self, index):
+        """Scale loop frame `index` up into `light`"""
+        self.half.blit(self.frames[index], (0, 0))
+        pygame.transform.scale(self.half, self.base.get_size(), self.light)
+        self.light_index = index
@@ -0,0 +1,95 @@
+"""
+Pixel-accurate collision against the opaque parts of sprites.
+
+Every check first compares bounding rects, which rules out almost every
+pair for the cost of a Rect method. Only pairs whose rects overlap go on
+to a mask test. Masks are built once per sprite and flip and then cached,
+so no frame ever builds one. Sprites drawn through the TransformCache get
+a mask per variant, keyed the same way, so the test matches what is on
+screen. Those masks are made from a variant built just for them, not one
+taken from the TransformCache, which belongs to whichever thread draws.
+"""
+import math
+import pygame
+
+from .sprites import transforms
+
+class MaskCache:
+    """Masks of sprites, built the first time each (image, flip) is tested"""
+    def __init__(self):
+        self.masks = {}
+        self.transformed_masks = {}
+        self.solids = {}
+
+    def get(self, image, flip=False):
+        # id() is only unique while the image is alive, so the entry keeps a
+        # reference to it and the identity check catches a recycled id
+        key = (id(image), flip)
+        entry = self.masks.get(key)
+        if entry is None or entry[0] is not image:
+            surface = pygame.transform.flip(image, True, False) if flip else image
+            entry = self.masks[key] = (image, pygame.mask.from_surface(surface))
+        return entry[1]
+
+    def transformed(self, image, angle=0, scale=1.0, flip=False):
+        """Mask of `image` as transforms.get() draws it with the same arguments"""
+        angle_step = transforms.quantize_angle(angle)
+        scale_step = transforms.quantize_scale(scale)
+        key = (id(image), angle_step, scale_step, flip)
+        entry = self.transformed_masks.get(key)
+        if entry is None or entry[0] is not image:
+            surface = transforms.transform(image, angle_step, scale_step, flip)
+            entry = self.transformed_masks[key] = (image, pygame.mask.from_surface(surface))
+        return entry[1]
+
+    def solid(self, size):
+        """A fully set mask, for testing a sprite against a plain rect"""
+        mask = self.solids.get(size)
+        if mask is None:
+            mask = self.solids[size] = pygame.Mask(size, fill=True)
+        return mask
+
+    def clear(self):
+        self.masks.clear()
+        self.transformed_masks.clear()
+
+masks = MaskCache()
+
+def collide_point(image, rect, point, flip=False):
+    """Whether `point` lands on an opaque pixel of `image` drawn at `rect`"""
+    if not rect.collidepoint(point):
+        return False
+    return bool(masks.get(image, flip).get_at((int(point[0]) - rect.x, int(point[1]) - rect.y)))
+
+def collide_point_transformed(image, center, point, angle=0, scale=1.0, flip=False):
+    """Whether `point` lands on an opaque pixel of `image` as transforms.get()
+    draws it, blitted centred on `center`"""
+    # Broadphase: the image's box, scaled and rotated, bounds the variant
+    # to within rotozoom's rounding, so most points never reach a mask
+    width, height = image.get_size()
+    zoom = transforms.scale_levels[transforms.quantize_scale(scale)]
+    turn = math.radians(transforms.quantize_angle(angle) * 360 / transforms.angle_steps)
+    cos, sin = abs(math.cos(turn)), abs(math.sin(turn))
+    if (abs(point[0] - center[0]) > (width * cos + height * sin) * zoom / 2 + 2 or
+            abs(point[1] - center[1]) > (width * sin + height * cos) * zoom / 2 + 2):
+        return False
+    mask = masks.transformed(image, angle, scale, flip)
+    width, height = mask.get_size()
+    x = int(point[0]) - int(center[0] - width // 2)
+    y = int(point[1]) - int(center[1] - height // 2)
+    if not (0 <= x < width and 0 <= y < height):
+        return False
+    return bool(mask.get_at((x, y)))
+
+def collide_rect(image, rect, other, flip=False):
+    """Whether the plain rect `other` covers an opaque pixel of `image` drawn at `rect`"""
+    if not rect.colliderect(other):
+        return False
+    return masks.get(image, flip).overlap(masks.solid(other.size), (other.x - rect.x, other.y - rect.y)) is not None
+
+def collide(image, rect, other_image, other_rect, flip=False, other_flip=False):
+    """Whether the opaque pixels of two sprites drawn at their rects overlap"""
+    if not rect.colliderect(other_rect):
+        return False
+    return masks.get(image, flip).overlap(
+        masks.get(other_image, other_flip), (other_rect.x - rect.x, other_rect.y - rect.y)) is not None
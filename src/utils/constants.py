@@ -4,6 +4,34 @@ import pygame
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 
+# Frame rate
+FPS = 60
+
+# Sprites
+PLAYER_IMAGE_SCALE = 0.15
+
+# Save states
+SAVE_FILE = 'ocean_explorer.sav'
+AUTOSAVE_INTERVAL = 5000  # milliseconds between autosaves
+
+# Session analytics
+TELEMETRY_FILE = 'ocean_explorer_analytics.db'
+
+# Co-op sessions
+NET_PORT = 47800
+NET_SEND_RATE = 20  # snapshots per second
+NET_INTEREST_RADIUS = 700  # pixels around a diver that get replicated
+NET_MAX_CLIENTS = 8
+NET_INTERP_DELAY = 100  # milliseconds clients render behind the server
+
+# Frame capture
+CAPTURE_FPS = 30
+CAPTURE_BUFFERS = 8  # screen-sized slots frames wait in for an encoder
+CAPTURE_WORKERS = 2  # encoder processes
+
+# Fonts
+FONT_NAME = 'Arial'
+
 # Colors
 BLUE = (0, 119, 190)
 WHITE = (255, 255, 255)
@@ -1,13 +1,32 @@
-import pygame
+import time
+from .timing import get_ticks
 
 DEBUG_MODE = False
 DEBUG_INTERVAL = 5000  # milliseconds between debug outputs
 last_debug_time = 0
 
+class StartupTimer:
+    """Collects how long each startup phase took and prints a breakdown"""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        print("Startup timing:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<12} {seconds * 1000:7.1f} ms")
+        print(f"  {'total':<12} {(self.last - self.start) * 1000:7.1f} ms")
+
 def debug_print(message, force=False):
     """Print debug messages only when DEBUG_MODE is on or force is True"""
     global last_debug_time
-    current_time = pygame.time.get_ticks()
+    current_time = get_ticks()
     
     # Always print forced messages or errors
     if force or "Error" in message:
@@ -0,0 +1,55 @@
+import os
+import json
+import pygame
+from .debug import debug_print
+
+FONTS_DIR = os.path.join('assets', 'fonts')
+FONT_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'ocean_explorer', 'fonts.json'
+)
+
+_font_paths = None
+
+def _load_cache():
+    global _font_paths
+    if _font_paths is None:
+        try:
+            with open(FONT_CACHE_FILE) as f:
+                _font_paths = json.load(f)
+        except (OSError, ValueError):
+            _font_paths = {}
+    return _font_paths
+
+def _save_cache():
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w') as f:
+            json.dump(_font_paths, f)
+    except OSError as e:
+        debug_print(f"Could not write font cache: {e}")
+
+def find_font(name):
+    """Path of the font file for `name`, or None for pygame's default font.
+
+    Fonts shipped in assets/fonts win. Otherwise the system lookup, which
+    scans the whole font database, runs once and its answer is cached on disk.
+    """
+    key = name.lower().replace(' ', '')
+    for ext in ('.ttf', '.otf'):
+        bundled = os.path.join(FONTS_DIR, key + ext)
+        if os.path.isfile(bundled):
+            return bundled
+
+    cache = _load_cache()
+    if key in cache and (cache[key] is None or os.path.isfile(cache[key])):
+        return cache[key]
+
+    path = pygame.font.match_font(name)
+    cache[key] = path
+    _save_cache()
+    return path
+
+def load_font(name, size):
+    """Same font as pygame.font.SysFont(name, size) without the system scan"""
+    return pygame.font.Font(find_font(name), size)
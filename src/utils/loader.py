@@ -1,16 +1,17 @@
 import os
+import json
 import pygame
 import random
 from .debug import debug_print
 from .constants import SCREEN_WIDTH, SCREEN_HEIGHT
 
-def load_image(name, scale=1.0):
+def load_image(name, scale=1.0, rng=random):
     try:
         fullname = os.path.join('assets', 'images', name)
         if not os.path.isfile(fullname):
             debug_print(f"Warning: Cannot find image file: {fullname}", True)
             surf = pygame.Surface((100, 100))
-            surf.fill((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+            surf.fill((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
             return surf
         image = pygame.image.load(fullname)
         if scale != 1.0:
@@ -21,7 +22,7 @@ def load_image(name, scale=1.0):
         debug_print(f"Cannot load image: {name}", True)
         debug_print(str(e), True)
         surf = pygame.Surface((100, 100))
-        surf.fill((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+        surf.fill((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
         return surf
 
 def load_sound(name):
@@ -37,6 +38,51 @@ def load_sound(name):
         debug_print(str(e), True)
         return None
 
+class ContentError(Exception):
+    pass
+
+def load_content(name):
+    """Parsed JSON from assets/content/`name`; raises ContentError if it can't be read"""
+    fullname = os.path.join('assets', 'content', name)
+    try:
+        with open(fullname, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ContentError(f"Cannot load content file {fullname}: {e}")
+
+def load_creature_content(name='creatures.json'):
+    """Creature entries (name, image, scale, clue, questions) from a content file"""
+    data = load_content(name)
+
+    def require(mapping, keys, where):
+        if not isinstance(mapping, dict):
+            raise ContentError(f"Malformed creature content in {name}: {where} is not an object")
+        for key in keys:
+            if key not in mapping:
+                raise ContentError(f"Malformed creature content in {name}: {where} is missing '{key}'")
+
+    require(data, ('creatures',), 'the file')
+    creatures = data['creatures']
+    if not isinstance(creatures, list):
+        raise ContentError(f"Malformed creature content in {name}: 'creatures' is not a list")
+    for i, entry in enumerate(creatures):
+        require(entry, ('name', 'image', 'clue', 'questions'), f"creature {i + 1}")
+        require(entry['clue'], ('text', 'hint'), f"the clue of {entry['name']}")
+        entry.setdefault('scale', 1.0)
+        questions = entry['questions']
+        if not isinstance(questions, list) or not questions:
+            raise ContentError(f"Malformed creature content in {name}: {entry['name']} has no questions")
+        for j, question in enumerate(questions):
+            require(question, ('question', 'answers', 'correct'), f"question {j + 1} of {entry['name']}")
+            try:
+                in_range = 0 <= question['correct'] < len(question['answers'])
+            except TypeError:
+                in_range = False
+            if not in_range:
+                raise ContentError(f"{entry['name']}: answer {question['correct']} "
+                                   f"out of range for \"{question['question']}\"")
+    return creatures
+
 def create_default_background():
     bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
     # Create gradient blue background
@@ -0,0 +1,229 @@
+"""
+Allocation and garbage collector instrumentation.
+
+AllocationTracker measures each phase of a frame with tracemalloc: net and
+peak bytes every frame, and on sampled frames a snapshot diff that counts
+new blocks and the lines that allocated them. GcMonitor times every
+collection through gc.callbacks. DeferredGc is a collection policy that
+freezes everything loaded at startup and runs collections on quiet frames
+instead of whenever the allocation counters trip.
+"""
+import gc
+import time
+import tracemalloc
+from collections import Counter
+
+from .debug import debug_print
+
+class PhaseStats:
+    __slots__ = ('frames', 'net_bytes', 'peak_bytes', 'sampled', 'new_blocks', 'new_bytes')
+
+    def __init__(self):
+        self.frames = 0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+        self.sampled = 0
+        self.new_blocks = 0
+        self.new_bytes = 0
+
+class Phase:
+    """Context manager measuring one named phase; reused every frame"""
+    __slots__ = ('tracker', 'stats', 'start', 'before')
+
+    def __init__(self, tracker, stats):
+        self.tracker = tracker
+        self.stats = stats
+        self.start = 0
+        self.before = None
+
+    def __enter__(self):
+        if self.tracker.sampling:
+            self.before = self.tracker.snapshot()
+        tracemalloc.reset_peak()
+        self.start = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc):
+        current, peak = tracemalloc.get_traced_memory()
+        stats = self.stats
+        stats.frames += 1
+        stats.net_bytes += current - self.start
+        stats.peak_bytes += peak - self.start
+        if self.before is not None:
+            self.tracker.compare(self.before, stats)
+            self.before = None
+        return False
+
+class AllocationTracker:
+    def __init__(self, sample_every=120):
+        self.sample_every = sample_every
+        self.phases = {}
+        self.sites = Counter()
+        self.frames = 0
+        self.sampling = False
+        self.filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ]
+        tracemalloc.start()
+
+    def phase(self, name):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, PhaseStats())
+        return phase
+
+    def end_frame(self):
+        self.frames += 1
+        self.sampling = self.frames % self.sample_every == 0
+
+    # Snapshots allocate tens of thousands of objects; keeping the collector
+    # off while they exist stops them triggering collections the game's own
+    # allocations never would
+    def snapshot(self):
+        enabled = gc.isenabled()
+        gc.disable()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.filters)
+        if enabled:
+            gc.enable()
+        return snapshot
+
+    def compare(self, before, stats):
+        enabled = gc.isenabled()
+        gc.disable()
+        after = tracemalloc.take_snapshot().filter_traces(self.filters)
+        stats.sampled += 1
+        for diff in after.compare_to(before, 'lineno'):
+            if diff.count_diff > 0:
+                stats.new_blocks += diff.count_diff
+                stats.new_bytes += diff.size_diff
+                self.sites[str(diff.traceback[0])] += diff.count_diff
+        del after
+        if enabled:
+            gc.enable()
+
+    def report(self, top=8):
+        phases = {}
+        for name, phase in self.phases.items():
+            s = phase.stats
+            frames = max(s.frames, 1)
+            sampled = max(s.sampled, 1)
+            phases[name] = {
+                'net_bytes_per_frame': round(s.net_bytes / frames),
+                'peak_bytes_per_frame': round(s.peak_bytes / frames),
+                'new_blocks_per_sampled_frame': round(s.new_blocks / sampled, 1),
+                'new_bytes_per_sampled_frame': round(s.new_bytes / sampled),
+            }
+        return {
+            'frames': self.frames,
+            'phases': phases,
+            'top_sites': self.sites.most_common(top),
+        }
+
+    def close(self):
+        tracemalloc.stop()
+
+class GcMonitor:
+    """Times every collection, per generation"""
+    def __init__(self, worst=10):
+        self.worst = worst
+        self.started = 0
+        self.counts = [0, 0, 0]
+        self.total_ms = [0.0, 0.0, 0.0]
+        self.max_ms = [0.0, 0.0, 0.0]
+        self.longest = []  # (ms, generation, collected)
+        gc.callbacks.append(self.callback)
+
+    def callback(self, phase, info):
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        ms = (time.perf_counter() - self.started) * 1000
+        generation = info['generation']
+        self.counts[generation] += 1
+        self.total_ms[generation] += ms
+        self.max_ms[generation] = max(self.max_ms[generation], ms)
+        if len(self.longest) < self.worst or ms > self.longest[-1][0]:
+            self.longest.append((ms, generation, info['collected']))
+            self.longest.sort(reverse=True)
+            del self.longest[self.worst:]
+
+    def report(self):
+        return {
+            'collections': self.counts,
+            'total_ms': [round(ms, 2) for ms in self.total_ms],
+            'max_ms': [round(ms, 3) for ms in self.max_ms],
+            'longest': [(round(ms, 3), gen, collected) for ms, gen, collected in self.longest],
+        }
+
+    def close(self):
+        if self.callback in gc.callbacks:
+            gc.callbacks.remove(self.callback)
+
+class DeferredGc:
+    """Collection policy for the game loop.
+
+    start() collects once, then gc.freeze()s everything loaded so far (the
+    assets, content and game state that live for the whole session) so
+    later collections never traverse it, and turns off automatic
+    collection. end_frame() collects young objects on quiet frames, such
+    as a quiz or a static screen, and does a full collection there at most
+    every `full_interval` seconds. During play it only collects if the
+    young generation grows past `max_pending` times its usual threshold.
+    """
+    def __init__(self, max_pending=20, full_interval=30.0):
+        self.threshold = gc.get_threshold()[0]
+        self.max_pending = max_pending
+        self.full_interval = full_interval
+        self.last_full = time.monotonic()
+        self.deferred = 0
+        self.forced = 0
+        self.frozen = 0
+
+    def start(self):
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        gc.disable()
+        debug_print(f"GC: froze {self.frozen} objects, collecting on quiet frames only")
+
+    def end_frame(self, quiet):
+        pending = gc.get_count()[0]
+        if quiet:
+            now = time.monotonic()
+            if now - self.last_full >= self.full_interval:
+                gc.collect()
+                self.last_full = now
+                self.deferred += 1
+            elif pending >= self.threshold:
+                gc.collect(1)
+                self.deferred += 1
+        elif pending >= self.threshold * self.max_pending:
+            gc.collect(0)
+            self.forced += 1
+
+    def report(self):
+        return {'frozen_objects': self.frozen, 'quiet_collections': self.deferred, 'forced_collections': self.forced}
+
+    def stop(self):
+        gc.enable()
+        gc.unfreeze()
+
+def print_report(allocations=None, gc_monitor=None, gc_policy=None):
+    if allocations:
+        report = allocations.report()
+        debug_print(f"Allocations over {report['frames']} frames:", True)
+        for name, phase in report['phases'].items():
+            debug_print(f"  {name}: {phase['net_bytes_per_frame']} B net, {phase['peak_bytes_per_frame']} B peak per frame; "
+                        f"{phase['new_blocks_per_sampled_frame']} new blocks ({phase['new_bytes_per_sampled_frame']} B) "
+                        f"per sampled frame", True)
+        for site, blocks in report['top_sites']:
+            debug_print(f"  {blocks:6d} blocks  {site}", True)
+    if gc_monitor:
+        report = gc_monitor.report()
+        debug_print(f"GC pauses: {report['collections']} collections per generation, "
+                    f"{report['total_ms']} ms total, {report['max_ms']} ms longest", True)
+    if gc_policy:
+        debug_print(f"GC policy: {gc_policy.report()}", True)
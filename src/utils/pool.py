@@ -0,0 +1,55 @@
+import gc
+import sys
+
+class ObjectPool:
+    """Free-list of reusable objects.
+
+    acquire() hands back a released object re-initialised through its reset()
+    method, and only calls the factory when the free list is empty. Objects
+    beyond `max_free` are dropped on release instead of being kept around.
+    """
+    def __init__(self, factory, max_free=64):
+        self.factory = factory
+        self.max_free = max_free
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+
+    def acquire(self, *args):
+        self.in_use += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        self.in_use -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, objects):
+        for obj in objects:
+            self.release(obj)
+
+    def stats(self):
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'in_use': self.in_use,
+            'free': len(self.free),
+        }
+
+def instance_size(obj):
+    """Shallow bytes used by an instance, including its __dict__ if it has one"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def gc_collections():
+    """Number of collections run so far in each GC generation"""
+    return [generation['collections'] for generation in gc.get_stats()]
@@ -0,0 +1,11 @@
+import copy
+
+def detach(entity):
+    """Copy of `entity` that a render thread can draw while the original
+    keeps updating"""
+    # A shallow copy shares nothing mutable with the live entity except its
+    # rect, which the draw methods reposition
+    clone = copy.copy(entity)
+    if hasattr(entity, 'rect'):
+        clone.rect = entity.rect.copy()
+    return clone
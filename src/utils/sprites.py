@@ -0,0 +1,181 @@
+from collections import OrderedDict
+import pygame
+
+ANGLE_STEPS = 36                     # 10 degree increments
+SCALE_LEVELS = (1.0, 1.04, 1.08, 1.12)
+CACHE_BYTES = 48 * 1024 * 1024
+SUPERSAMPLE = 4
+BUBBLE_SOURCE_SIZE = 128
+
+class TransformCache:
+    """Rotated/scaled/flipped copies of sprites at quantized steps.
+
+    Angles snap to one of `angle_steps` directions and scales to the nearest
+    of `scale_levels`, so a sprite has a small, fixed set of variants. Each
+    variant is made with rotozoom the first time it is asked for and reused
+    after that. Variants are kept in least-recently-used order and the
+    oldest are dropped once they take more than `max_bytes` of pixels.
+    """
+    def __init__(self, angle_steps=ANGLE_STEPS, scale_levels=SCALE_LEVELS, max_bytes=CACHE_BYTES):
+        self.angle_steps = angle_steps
+        self.scale_levels = scale_levels
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize_angle(self, angle):
+        step = 360 / self.angle_steps
+        return int(round(angle / step)) % self.angle_steps
+
+    def quantize_scale(self, scale):
+        levels = self.scale_levels
+        return min(range(len(levels)), key=lambda i: abs(levels[i] - scale))
+
+    def get(self, image, angle=0, scale=1.0, flip=False):
+        """`image` flipped horizontally if `flip`, then rotated `angle` degrees
+        counter-clockwise and scaled by `scale`, all snapped to the cache's steps"""
+        angle_step = self.quantize_angle(angle)
+        scale_step = self.quantize_scale(scale)
+        # id() is only unique while the image is alive, so the entry keeps a
+        # reference to it and the identity check catches a recycled id
+        key = (id(image), angle_step, scale_step, flip)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] is image:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        surface = self.transform(image, angle_step, scale_step, flip)
+        if entry is not None:
+            self._drop(key)
+        self.entries[key] = (image, surface)
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+        return surface
+
+    def transform(self, image, angle_step, scale_step, flip):
+        """The variant get() caches for these steps, made anew. Touches no
+        cache state, so it is safe on any thread."""
+        surface = pygame.transform.flip(image, True, False) if flip else image
+        zoom = self.scale_levels[scale_step]
+        if angle_step or zoom != 1.0:
+            surface = pygame.transform.rotozoom(surface, angle_step * 360 / self.angle_steps, zoom)
+        return surface
+
+    def _drop(self, key):
+        _, surface = self.entries.pop(key)
+        self.bytes -= surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+transforms = TransformCache()
+
+class PrimitiveCache:
+    """Procedural shapes rasterized once into alpha surfaces.
+
+    Shapes are drawn at `supersample` times their size and smoothscaled
+    down, which anti-aliases their edges. Each (shape, size, colour) is
+    only drawn once; after that drawing it costs a single blit. The set of
+    shapes the game uses is small and fixed, so nothing is ever evicted.
+    """
+    def __init__(self, supersample=SUPERSAMPLE):
+        self.supersample = supersample
+        self.surfaces = {}
+        self.texts = {}
+        self.bubble_image = None
+
+    def cached(self, key, build):
+        """Surface for `key`, calling `build()` to make it the first time"""
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = build()
+        return surface
+
+    def smooth(self, size, draw, background=(0, 0, 0)):
+        """Surface of `size` made by calling draw(surface, k) on one k times larger.
+
+        `background` is the colour of the transparent pixels, which blend
+        into the edges when scaling down; use the shape's own colour.
+        """
+        k = self.supersample
+        big = pygame.Surface((size[0] * k, size[1] * k), pygame.SRCALPHA)
+        big.fill((*background[:3], 0))
+        draw(big, k)
+        return pygame.transform.smoothscale(big, size).convert_alpha()
+
+    def draw_circle(self, radius, color, width=0):
+        """Circle of `radius` centred in a (2 * radius + 2) pixel square,
+        drawn anew and not cached"""
+        side = 2 * radius + 2
+        return self.smooth((side, side), lambda s, k: pygame.draw.circle(
+            s, color, (side * k // 2, side * k // 2), radius * k, width * k), color)
+
+    def circle(self, radius, color, width=0):
+        """Cached draw_circle()"""
+        return self.cached(('circle', radius, color, width), lambda: self.draw_circle(radius, color, width))
+
+    def rounded_rect(self, width, height, color, border_radius, border=0):
+        def build():
+            return self.smooth((width, height), lambda s, k: pygame.draw.rect(
+                s, color, (0, 0, width * k, height * k), border * k, border_radius=border_radius * k), color)
+        return self.cached(('rect', width, height, color, border_radius, border), build)
+
+    def text(self, font, text, color):
+        # The font is part of the cached value so its id can't be recycled
+        key = (id(font), text, color)
+        entry = self.texts.get(key)
+        if entry is None or entry[0] is not font:
+            entry = self.texts[key] = (font, font.render(text, True, color))
+        return entry[1]
+
+    def set_bubble_image(self, image):
+        """Draw bubbles from `image` instead of as plain circles"""
+        # Bubbles are at most 82 px across; shrinking a large source once
+        # keeps building each size cheap
+        if image.get_width() > BUBBLE_SOURCE_SIZE:
+            image = pygame.transform.smoothscale(image, (BUBBLE_SOURCE_SIZE, BUBBLE_SOURCE_SIZE))
+        self.bubble_image = image
+        for key in [key for key in self.surfaces if key[0] == 'bubble']:
+            del self.surfaces[key]
+
+    def draw_bubble(self, size, color):
+        """Bubble of radius `size` tinted toward `color`, drawn anew and not
+        cached. Safe off the game thread, as it only reads the bubble image."""
+        image = self.bubble_image
+        if image is None:
+            return self.draw_circle(size, color)
+        side = 2 * size + 2
+        surface = pygame.transform.smoothscale(image, (side, side))
+        tint = tuple(min(255, c + 80) for c in color)
+        surface.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+        return surface.convert_alpha()
+
+    def bubble(self, size, color):
+        """Cached draw_bubble()"""
+        return self.cached(('bubble', size, color), lambda: self.draw_bubble(size, color))
+
+    def stats(self):
+        surfaces = list(self.surfaces.values()) + [surface for _, surface in self.texts.values()]
+        return {
+            'surfaces': len(surfaces),
+            'bytes': sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces),
+        }
+
+primitives = PrimitiveCache()
@@ -0,0 +1,124 @@
+import time
+import sqlite3
+import threading
+from collections import deque
+
+from .debug import debug_print
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    seed INTEGER
+);
+CREATE TABLE IF NOT EXISTS events (
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    ticks INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    subject TEXT,
+    item INTEGER,
+    value INTEGER,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS events_session_kind ON events(session, kind);
+"""
+
+class Telemetry:
+    """Session analytics written to SQLite from a background thread.
+
+    record() only appends a tuple to a bounded deque, which is atomic under
+    the GIL, so the game thread never takes a lock or touches the database.
+    When the queue is full new events are dropped and counted rather than
+    blocking the frame. Each drop counter is only written by one thread:
+    dropped_full by the game, dropped_error by the writer. The writer
+    drains the queue in batches, one transaction per batch, into a
+    WAL-mode database.
+    """
+    def __init__(self, path, seed=None, capacity=8192, batch_size=512, flush_interval=1.0):
+        self.path = path
+        self.seed = seed
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = deque()
+        self.recorded = 0
+        self.dropped_full = 0   # queue full; game thread only
+        self.dropped_error = 0  # failed writes; writer thread only
+        self.written = 0
+        self.batches = 0
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread = threading.Thread(target=self._writer, name='telemetry', daemon=True)
+        self.thread.start()
+
+    def record(self, ticks, kind, subject='', item=0, value=0, detail=''):
+        queue = self.queue
+        if len(queue) >= self.capacity:
+            self.dropped_full += 1
+            return
+        queue.append((ticks, kind, subject, item, value, detail))
+        self.recorded += 1
+        # Backpressure: wake the writer early instead of waiting for the timer
+        if len(queue) == self.batch_size:
+            self.wake.set()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(SCHEMA)
+        with db:
+            session = db.execute('INSERT INTO sessions (started, seed) VALUES (?, ?)',
+                                 (time.time(), self.seed)).lastrowid
+        return db, session
+
+    def _writer(self):
+        try:
+            db, session = self._connect()
+        except sqlite3.Error as e:
+            debug_print(f"Error opening analytics database {self.path}: {e}", True)
+            self.closed = True
+            return
+
+        queue = self.queue
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            # Read before draining: everything recorded before close() is
+            # then already queued, so the drain below is the last one needed
+            closed = self.closed
+            while queue:
+                batch = []
+                while queue and len(batch) < self.batch_size:
+                    batch.append((session,) + queue.popleft())
+                try:
+                    with db:
+                        db.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)', batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except sqlite3.Error as e:
+                    self.dropped_error += len(batch)
+                    debug_print(f"Error writing analytics: {e}", True)
+            if closed:
+                break
+        db.close()
+
+    def stats(self):
+        return {
+            'recorded': self.recorded,
+            'written': self.written,
+            'dropped_full': self.dropped_full,
+            'dropped_error': self.dropped_error,
+            'queued': len(self.queue),
+            'batches': self.batches,
+        }
+
+    def close(self):
+        """Write out everything still queued and stop the writer"""
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        stats = self.stats()
+        debug_print(f"Analytics: {stats['written']} of {stats['recorded']} events written in "
+                    f"{stats['batches']} batches ({stats['dropped_full']} dropped with the queue full, "
+                    f"{stats['dropped_error']} on write errors)", True)
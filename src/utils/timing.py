@@ -0,0 +1,32 @@
+import time
+from .constants import FPS
+
+# Gameplay code reads the time through get_ticks() rather than calling
+# pygame.time.get_ticks() directly, so a recorded session can be replayed
+# against a deterministic frame clock instead of the wall clock. The wall
+# clock is kept here too, since pygame's only runs once SDL's timer is up.
+_time_source = None
+_start = time.perf_counter()
+
+def get_ticks():
+    """Milliseconds of game time, from the injected source if one is set"""
+    if _time_source is None:
+        return int((time.perf_counter() - _start) * 1000)
+    return _time_source()
+
+def set_time_source(source):
+    """Install a callable returning milliseconds, or None for the wall clock"""
+    global _time_source
+    _time_source = source
+
+class FrameClock:
+    """Clock that advances by exactly one frame every time advance() is called"""
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.frame = 0
+
+    def advance(self):
+        self.frame += 1
+
+    def __call__(self):
+        return self.frame * 1000 // self.fps
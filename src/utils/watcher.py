@@ -0,0 +1,39 @@
+import os
+import time
+
+class FileWatcher:
+    """Reports files under some directories that changed since the last poll.
+
+    Polls os.stat() rather than relying on OS notifications, so it works
+    the same everywhere with no extra services. A scan only happens once
+    every `interval` seconds however often poll() is called.
+    """
+    def __init__(self, roots, interval=1.0):
+        self.roots = roots
+        self.interval = interval
+        self.next_scan = time.monotonic() + interval
+        self.known = self.scan()
+
+    def scan(self):
+        files = {}
+        for root in self.roots:
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # removed while we were walking
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self):
+        """Paths added or modified since the previous scan"""
+        now = time.monotonic()
+        if now < self.next_scan:
+            return []
+        self.next_scan = now + self.interval
+        files = self.scan()
+        changed = [path for path, signature in files.items() if self.known.get(path) != signature]
+        self.known = files
+        return changed
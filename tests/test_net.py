@@ -0,0 +1,130 @@
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.core.input import KeyState
+from src.net import protocol, LoopbackNetwork, GameServer, NetworkClient
+from src.net.protocol import (
+    quantize, dequantize, encode_snapshot, decode_snapshot, entity_id,
+    KIND_PLAYER, KIND_CREATURE, SNAPSHOT_HEADER, POSITION_OFFSET, POSITION_SCALE
+)
+from src.net.server import HISTORY
+
+def baseline_of(packet):
+    return SNAPSHOT_HEADER.unpack_from(packet, protocol.PACKET_TYPE.size)[1]
+
+class QuantizationTest(unittest.TestCase):
+    def test_round_trip_within_an_eighth_of_a_pixel(self):
+        for value in (-POSITION_OFFSET, -40.3, 0, 0.06, 959.5, 1919.9, 7935.8):
+            self.assertAlmostEqual(dequantize(quantize(value)), value, delta=0.5 / POSITION_SCALE)
+
+    def test_clamps_outside_the_field(self):
+        self.assertEqual(quantize(-POSITION_OFFSET - 100), 0)
+        self.assertEqual(quantize(100000), 0xFFFF)
+
+class SnapshotCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.a = entity_id(KIND_CREATURE, 0)
+        self.b = entity_id(KIND_CREATURE, 1)
+        self.baseline = {self.a: (100, 200, 1, 0), self.b: (300, 400, 0, 5)}
+
+    def test_full_snapshot(self):
+        packet = encode_snapshot(1, 0, 10, self.baseline, {})
+        self.assertEqual(decode_snapshot(packet, {}), (1, 10, self.baseline))
+
+    def test_delta_sends_only_changed_fields(self):
+        state = {self.a: (108, 200, 1, 0), self.b: (300, 400, 0, 5)}
+        full = encode_snapshot(2, 0, 11, state, {})
+        delta = encode_snapshot(2, 1, 11, state, self.baseline)
+        self.assertLess(len(delta), len(full))
+        self.assertEqual(decode_snapshot(delta, {1: self.baseline}), (2, 11, state))
+
+    def test_removed_entities(self):
+        state = {self.a: (100, 200, 1, 0)}
+        packet = encode_snapshot(2, 1, 11, state, self.baseline)
+        self.assertEqual(decode_snapshot(packet, {1: self.baseline})[2], state)
+
+    def test_unknown_baseline(self):
+        packet = encode_snapshot(2, 1, 11, self.baseline, self.baseline)
+        self.assertIsNone(decode_snapshot(packet, {}))
+
+class LoopbackSessionTest(unittest.TestCase):
+    """A server and a client talking through LoopbackNetwork"""
+    def setUp(self):
+        self.network = LoopbackNetwork()
+        self.server = GameServer(self.network.endpoint('server'), seed=5)
+        self.transport = self.network.endpoint('client')
+        self.client = NetworkClient(self.transport, 'server')
+        self.client.send(protocol.PACKET_TYPE.pack(protocol.HELLO))
+        self.server.tick()
+        self.client.poll()
+        self.assertIsNotNone(self.client.client_id)
+        self.remote = next(iter(self.server.clients.values()))
+        self.own = entity_id(KIND_PLAYER, self.client.client_id)
+
+    def next_snapshot(self, ack=True):
+        """Run the server up to its next snapshot; returns the raw packet after the client decodes it"""
+        if ack:
+            self.client.send_input(KeyState(), (0, 0), False)
+        seq = self.server.snapshot_seq
+        while self.server.snapshot_seq == seq:
+            self.server.tick()
+        (packet, _), = [p for p in self.transport.receive() if p[0][0] == protocol.SNAPSHOT]
+        self.client.receive_snapshot(packet)
+        return packet
+
+    def test_deltas_against_the_acked_baseline(self):
+        first = self.next_snapshot()
+        self.assertEqual(baseline_of(first), 0)
+        acked = self.client.acked
+        second = self.next_snapshot()
+        self.assertEqual(baseline_of(second), acked)
+        self.assertLess(len(second), len(first))
+        # The delta decodes to exactly what the server meant to send
+        self.assertEqual(self.client.latest(), self.remote.history[self.client.acked])
+
+    def test_falls_back_to_a_full_snapshot_once_the_baseline_ages_out(self):
+        self.next_snapshot()
+        self.next_snapshot()
+        acked = baseline_of(self.next_snapshot(ack=False))
+        self.assertNotEqual(acked, 0)
+        # Inputs carrying newer acks are lost, so the server keeps encoding
+        # against the same baseline until it leaves the history
+        for _ in range(HISTORY - 2):
+            self.assertEqual(baseline_of(self.next_snapshot(ack=False)), acked)
+        packet = self.next_snapshot(ack=False)
+        self.assertEqual(baseline_of(packet), 0)
+        self.assertEqual(self.client.latest(), self.remote.history[self.client.acked])
+
+    def test_client_skips_deltas_against_baselines_it_dropped(self):
+        full = self.next_snapshot()
+        self.next_snapshot()
+        latest = self.client.latest()
+        self.client.baselines.clear()
+        packet = self.next_snapshot()
+        # A real delta, smaller than a full snapshot, that the client can't use
+        self.assertNotEqual(baseline_of(packet), 0)
+        self.assertLess(len(packet), len(full))
+        self.assertEqual(self.client.stale, 1)
+        self.assertEqual(self.client.latest(), latest)
+
+    def test_entities_leaving_the_area_of_interest_are_removed(self):
+        creature = self.server.game.creatures[0]
+        eid = entity_id(KIND_CREATURE, 0)
+        self.server.interest_radius = 300
+        # A busy diver isn't moved by the server, so it stays where it's put
+        self.remote.busy = True
+        self.remote.player.x, self.remote.player.y = creature.x, creature.y
+        self.next_snapshot(ack=False)
+        self.assertIn(eid, self.client.latest())
+        self.client.send_input(KeyState(), (0, 0), False, busy=True)
+        self.remote.player.y = creature.y + 2000
+        packet = self.next_snapshot(ack=False)
+        self.assertNotEqual(baseline_of(packet), 0)
+        self.assertNotIn(eid, self.client.latest())
+        self.assertIn(self.own, self.client.latest())
+
+if __name__ == '__main__':
+    unittest.main()